@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from api.core.config import get_settings
 from api.core.exceptions import AppExceptions
+from config.permissions import permissions_to_mask
 from utils.jwt import JWT
 
 settings = get_settings()
@@ -25,16 +26,16 @@ def permission_required(
 
         return Depends(skip_check_permission)
 
+    required_mask = permissions_to_mask(required_permissions)
+
     async def permission_check(
         user_decode_token: dict[str, str] = Depends(get_user_token),
     ):
-        permissions: list[str] | None = user_decode_token.get("permissions", [])
-        required_user_permission = [
-            permission
-            for permission in permissions
-            if permission in required_permissions
-        ]
-        if not required_user_permission:
+        mask: int | None = user_decode_token.get("pmask")
+        if mask is None:
+            # tokens issued before the pmask claim carry only the names
+            mask = permissions_to_mask(user_decode_token.get("permissions", []))
+        if not mask & required_mask:
             raise AppExceptions.forbidden_exception(
                 "Forbidden: insufficient permissions"
             )
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.repositories.postgres.devicesRepo import PostgresDeviceRepo
 from db.repositories.postgres.roleRepo import PostgresRoleRepo
+from db.repositories.postgres.syncRepo import PostgresSyncRepo
 from db.repositories.postgres.usersRepo import PostgresUserRepo
 from db.session import get_session
 
@@ -17,3 +18,7 @@ async def get_user_repository(session: AsyncSession = Depends(get_session)):
 
 async def get_device_repository(session: AsyncSession = Depends(get_session)):
     return PostgresDeviceRepo(session)
+
+
+async def get_sync_repository(session: AsyncSession = Depends(get_session)):
+    return PostgresSyncRepo(session)
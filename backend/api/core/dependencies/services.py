@@ -3,6 +3,7 @@ from fastapi import Depends
 from api.core.dependencies.repositories import (
     get_device_repository,
     get_role_repository,
+    get_sync_repository,
     get_user_repository,
 )
 from api.v1.auth.service import AuthService
@@ -10,6 +11,8 @@ from api.v1.devices.repo_interface import IDeviceRepository
 from api.v1.devices.service import DeviceService
 from api.v1.roles.repo_interface import IRoleRepository
 from api.v1.roles.service import RoleService
+from api.v1.sync.repo_interface import ISyncRepository
+from api.v1.sync.service import SyncService
 from api.v1.users.repo_interface import IUserRepository
 from api.v1.users.service import UserService
 
@@ -34,6 +37,13 @@ async def get_device_service(
 
 
 async def get_auth_service(
-    repo: IDeviceRepository = Depends(get_user_repository),
+    repo: IUserRepository = Depends(get_user_repository),
+    role_repo: IRoleRepository = Depends(get_role_repository),
+):
+    return AuthService(repo, role_repo)
+
+
+async def get_sync_service(
+    repo: ISyncRepository = Depends(get_sync_repository),
 ):
-    return AuthService(repo)
+    return SyncService(repo)
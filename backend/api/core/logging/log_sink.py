@@ -0,0 +1,105 @@
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, RotatingFileHandler
+
+_STOP = object()
+
+
+class BatchRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that writes a batch of records with a single flush."""
+
+    def emit_batch(self, records: list[logging.LogRecord]) -> None:
+        self.acquire()
+        try:
+            for record in records:
+                try:
+                    if self.shouldRollover(record):
+                        self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                    self.stream.write(self.format(record) + self.terminator)
+                except Exception:
+                    self.handleError(record)
+            if self.stream is not None:
+                self.flush()
+        finally:
+            self.release()
+
+
+class LogQueueHandler(QueueHandler):
+    """QueueHandler that either drops or blocks when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue, block_on_full: bool = False):
+        super().__init__(log_queue)
+        self._block_on_full = block_on_full
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._block_on_full:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener:
+    """Background thread that drains the log queue into a batch handler.
+
+    A batch is written once it holds ``batch_size`` records or once
+    ``flush_interval`` seconds have passed since the previous write.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        handler: BatchRotatingFileHandler,
+        batch_size: int,
+        flush_interval: float,
+    ):
+        self.queue = log_queue
+        self.handler = handler
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._thread: threading.Thread | None = None
+        self.written = 0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self.queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _write(self, batch: list[logging.LogRecord]) -> None:
+        if batch:
+            self.handler.emit_batch(batch)
+            self.written += len(batch)
+
+    def _run(self) -> None:
+        batch: list[logging.LogRecord] = []
+        deadline = time.monotonic() + self._flush_interval
+        while True:
+            try:
+                record = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                record = None
+            if record is _STOP:
+                self._write(batch)
+                self.handler.close()
+                return
+            if record is not None:
+                batch.append(record)
+            if len(batch) >= self._batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self._flush_interval
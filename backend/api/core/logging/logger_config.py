@@ -1,23 +1,64 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
 from pathlib import Path
 
+from api.core.config import get_settings
+from api.core.logging.log_sink import (
+    BatchingQueueListener,
+    BatchRotatingFileHandler,
+    LogQueueHandler,
+)
+
+settings = get_settings()
+
 LOG_DIR_NAME = "logs"
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 LOG_DIR = PROJECT_ROOT / LOG_DIR_NAME
 os.makedirs(LOG_DIR, exist_ok=True)
 
-logger = logging.getLogger("app_logger")
-logger.setLevel(logging.INFO)
+formatter = logging.Formatter("%(asctime)s | %(message)s")
 
-file_handler = RotatingFileHandler(
-    filename=os.path.join(LOG_DIR, "app.log"),
-    maxBytes=5 * 1024 * 1024,
-    backupCount=5,
-    encoding="utf-8",
-)
 
-formatter = logging.Formatter("%(asctime)s | %(message)s")
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+def _queued_file_logger(
+    name: str, filename: str
+) -> tuple[logging.Logger, LogQueueHandler, BatchingQueueListener]:
+    """Logger whose records are written to ``filename`` by a background thread."""
+    file_handler = BatchRotatingFileHandler(
+        filename=os.path.join(LOG_DIR, filename),
+        maxBytes=5 * 1024 * 1024,
+        backupCount=5,
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(formatter)
+
+    queue_handler = LogQueueHandler(
+        queue.Queue(maxsize=settings.LOG_QUEUE_SIZE),
+        block_on_full=settings.LOG_QUEUE_FULL_POLICY == "block",
+    )
+    named_logger = logging.getLogger(name)
+    named_logger.setLevel(logging.INFO)
+    named_logger.addHandler(queue_handler)
+
+    listener = BatchingQueueListener(
+        queue_handler.queue,
+        file_handler,
+        batch_size=settings.LOG_BATCH_SIZE,
+        flush_interval=settings.LOG_FLUSH_INTERVAL_S,
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return named_logger, queue_handler, listener
+
+
+logger, queue_handler, log_listener = _queued_file_logger("app_logger", "app.log")
+slow_query_logger, _, _ = _queued_file_logger("slow_query", "slow_queries.log")
+
+
+def log_sink_stats() -> dict[str, int]:
+    return {
+        "queued": queue_handler.queue.qsize(),
+        "dropped": queue_handler.dropped,
+        "written": log_listener.written,
+    }
@@ -1,17 +1,40 @@
 import json
 import time
-from typing import Callable
 from urllib.parse import parse_qsl, urlencode
 
-from fastapi import Request, Response, UploadFile
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, QueryParams, UploadFile
+from starlette.formparsers import MultiPartParser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from api.core.logging.logger_config import logger
+from api.core.metrics.server_timing import QUERY_STATS_SCOPE_KEY
 
-MAX_BODY_LOG_SIZE = 10 * 1024 * 1024
+MAX_BODY_LOG_SIZE = 64 * 1024
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class BodyCapture:
+    """Keeps the first ``limit`` bytes of a streamed body and counts the rest."""
+
+    def __init__(self, limit: int = MAX_BODY_LOG_SIZE):
+        self._limit = limit
+        self._buffer = bytearray()
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        free = self._limit - len(self._buffer)
+        if free > 0:
+            self._buffer += chunk[:free]
+
+    @property
+    def truncated(self) -> bool:
+        return self.size > self._limit
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buffer)
+
+
+class LoggingMiddleware:
     SECRET_FIELDS = {
         "password",
         "token",
@@ -25,6 +48,9 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         "client_secret",
     }
 
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
     def mask_secrets(self, obj):
         """Recursively replaces all secret fields with '********'"""
         if isinstance(obj, dict):
@@ -40,88 +66,97 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             return [self.mask_secrets(i) for i in obj]
         return obj
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.time()
+        request_body = BodyCapture()
+        response_body = BodyCapture()
+        status_code = 500
+
+        async def logged_receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                request_body.feed(message.get("body", b""))
+            return message
+
+        async def logged_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_body.feed(message.get("body", b""))
+            await send(message)
 
         try:
-            body_bytes = await request.body()
-            content_type = request.headers.get("content-type", "")
-
-            if "multipart/form-data" in content_type:
-                body_summary = {}
-                form = await request.form()
-                for key, value in form.multi_items():
-                    if isinstance(value, UploadFile):
-                        body_summary[key] = {
-                            "filename": value.filename,
-                            "content_type": value.content_type,
-                        }
-                    else:
-                        body_summary[key] = value
-                body = self.mask_secrets(body_summary)
-
-            elif "application/x-www-form-urlencoded" in content_type:
-                text = body_bytes.decode("utf-8", errors="ignore")
-                form_dict = dict(parse_qsl(text))
-                masked_form = self.mask_secrets(form_dict)
-                body = urlencode(masked_form)
-
-            else:
-                text = body_bytes.decode("utf-8", errors="ignore")
-                if len(text) > MAX_BODY_LOG_SIZE:
-                    body = f"<text too long: {len(text)} bytes>"
-                else:
-                    try:
-                        body_json = json.loads(text)
-                        body = self.mask_secrets(body_json)
-                    except Exception:
-                        body = text
+            await self.app(scope, logged_receive, logged_send)
+        finally:
+            headers = Headers(scope=scope)
+            client = scope.get("client")
+            query_stats = scope.get(QUERY_STATS_SCOPE_KEY)
+            log_data = {
+                "method": scope["method"],
+                "status_code": status_code,
+                "path": scope["path"],
+                "query_params": dict(QueryParams(scope.get("query_string", b""))),
+                "client": client[0] if client else "unknown",
+                "process_time_s": round(time.time() - start_time, 3),
+                "db_queries": query_stats.count if query_stats else 0,
+                "db_time_s": round(query_stats.total_time_s, 3) if query_stats else 0,
+                "request_body": await self._describe_request(request_body, headers),
+                "response_body": self._describe_response(response_body),
+                "headers": dict(headers),
+            }
+            logger.info(json.dumps(log_data, ensure_ascii=False))
 
-            async def receive() -> dict:
-                return {"type": "http.request", "body": body_bytes}
+    async def _describe_request(self, captured: BodyCapture, headers: Headers):
+        if captured.truncated:
+            return f"<text too long: {captured.size} bytes>"
+        try:
+            body_bytes = captured.getvalue()
+            content_type = headers.get("content-type", "")
 
-            request._receive = receive
+            if "multipart/form-data" in content_type:
+                return self.mask_secrets(
+                    await self._summarize_form(body_bytes, headers)
+                )
 
+            text = body_bytes.decode("utf-8", errors="ignore")
+            if "application/x-www-form-urlencoded" in content_type:
+                return urlencode(self.mask_secrets(dict(parse_qsl(text))))
+            try:
+                return self.mask_secrets(json.loads(text))
+            except Exception:
+                return text
         except Exception:
-            body = "<cannot read body>"
+            return "<cannot read body>"
 
-        response = await call_next(request)
-
-        resp_body = b""
-        async for chunk in response.body_iterator:
-            resp_body += chunk
-
-        async def new_body_iterator():
-            yield resp_body
-
-        response.body_iterator = new_body_iterator()
+    @staticmethod
+    async def _summarize_form(body_bytes: bytes, headers: Headers) -> dict:
+        async def stream():
+            yield body_bytes
 
+        form = await MultiPartParser(headers, stream()).parse()
         try:
-            resp_content = resp_body.decode("utf-8", errors="ignore")
-            if len(resp_content) > MAX_BODY_LOG_SIZE:
-                resp_content = f"<response too long: {len(resp_content)} bytes>"
-            else:
-                try:
-                    resp_content = json.loads(resp_content)
-                except Exception:
-                    pass
-        except Exception:
-            resp_content = "<cannot decode response>"
-
-        process_time = time.time() - start_time
-        client_host = request.client.host if request.client else "unknown"
-
-        log_data = {
-            "method": request.method,
-            "status_code": response.status_code,
-            "path": request.url.path,
-            "query_params": dict(request.query_params),
-            "client": client_host,
-            "process_time_s": round(process_time, 3),
-            "request_body": body,
-            "response_body": resp_content,
-            "headers": dict(request.headers),
-        }
-
-        logger.info(json.dumps(log_data, ensure_ascii=False))
-        return response
+            body_summary = {}
+            for key, value in form.multi_items():
+                if isinstance(value, UploadFile):
+                    body_summary[key] = {
+                        "filename": value.filename,
+                        "content_type": value.content_type,
+                    }
+                else:
+                    body_summary[key] = value
+            return body_summary
+        finally:
+            await form.close()
+
+    @staticmethod
+    def _describe_response(captured: BodyCapture):
+        # logged as text: parsing every response only to dump it again cost
+        # more than writing it
+        if captured.truncated:
+            return f"<response too long: {captured.size} bytes>"
+        return captured.getvalue().decode("utf-8", errors="replace")
@@ -0,0 +1,34 @@
+from api.core.logging.logger_config import log_sink_stats
+from api.core.metrics.registry import metrics
+from api.v1.events.broker import event_broker
+from api.v1.roles.registry import role_registry
+from db.session import async_engine, replica_engines
+from utils.hashing import hashing_pool
+from utils.jwt import token_cache
+
+component_stats = metrics.gauge(
+    "app_component_stats",
+    "Internal counters of in-process components, refreshed on scrape.",
+    ("component", "stat"),
+)
+
+COMPONENTS = {
+    "db_pool": lambda: async_engine.sync_engine.pool.stats(),
+    "event_broker": event_broker.stats,
+    "hashing_pool": hashing_pool.stats,
+    "log_sink": log_sink_stats,
+    "role_registry": role_registry.stats,
+    "token_cache": token_cache.stats,
+}
+for i, replica in enumerate(replica_engines):
+    COMPONENTS[f"db_replica_pool_{i}"] = replica.sync_engine.pool.stats
+
+
+def collect_component_stats() -> None:
+    for component, stats in COMPONENTS.items():
+        for stat, value in stats().items():
+            if isinstance(value, (int, float)):
+                component_stats.set((component, stat), value)
+
+
+metrics.add_collector(collect_component_stats)
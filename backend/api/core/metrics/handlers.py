@@ -0,0 +1,47 @@
+import hmac
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import PlainTextResponse
+
+from api.core.config import get_settings
+from api.core.exceptions import AppExceptions
+from api.core.metrics.multiprocess import metrics_store
+from api.core.metrics.registry import metrics
+from db.session import async_engine, replica_engines
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+settings = get_settings()
+
+
+async def metrics_token_required(authorization: str | None = Header(None)) -> None:
+    """Require ``Authorization: Bearer <METRICS_TOKEN>`` once a token is set."""
+    if not settings.METRICS_TOKEN:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise AppExceptions.unauthorized_exception("Invalid metrics token.")
+
+
+metrics_router = APIRouter(
+    tags=["metrics"], dependencies=[Depends(metrics_token_required)]
+)
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    if metrics_store is not None:
+        body = await metrics_store.render_async()
+    else:
+        body = metrics.render()
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@metrics_router.get("/metrics/db-pool", include_in_schema=False)
+async def get_db_pool_stats():
+    return {
+        "primary": async_engine.sync_engine.pool.stats(),
+        "replicas": [engine.sync_engine.pool.stats() for engine in replica_engines],
+    }
@@ -0,0 +1,75 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.core.metrics.registry import SIZE_BUCKETS, metrics
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+requests_total = metrics.counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status.",
+    ("method", "route", "status"),
+)
+request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds.",
+    ("method", "route", "status"),
+)
+response_size = metrics.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size in bytes.",
+    ("method", "route", "status"),
+    buckets=SIZE_BUCKETS,
+)
+requests_in_progress = metrics.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ("method",),
+    multiprocess_mode="sum",
+)
+
+
+class MetricsMiddleware:
+    """Records per-route request metrics.
+
+    The route label is the matched path template (``/v1/users/{user_id}``),
+    never the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        body_size = 0
+
+        async def measured_send(message: Message) -> None:
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        requests_in_progress.inc((method,))
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, measured_send)
+        finally:
+            duration = time.perf_counter() - start_time
+            requests_in_progress.dec((method,))
+            route = scope.get("route")
+            labels = (
+                method,
+                route.path if route is not None else UNMATCHED_ROUTE,
+                str(status_code),
+            )
+            requests_total.inc(labels)
+            request_duration.observe(labels, duration)
+            response_size.observe(labels, body_size)
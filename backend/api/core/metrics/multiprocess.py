@@ -0,0 +1,118 @@
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+
+from api.core.config import get_settings
+from api.core.metrics.registry import Gauge, MetricsRegistry, metrics
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsFileStore:
+    """Shares metrics between uvicorn workers through snapshot files.
+
+    Every worker periodically writes its own snapshot to ``directory``, and
+    whichever worker serves a scrape merges all of them. Counters and
+    histograms of exited workers are kept so totals never go backwards; their
+    gauges are dropped. Clear the directory when deploying a new release.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str, interval: float):
+        self._registry = registry
+        self._directory = Path(directory)
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+
+    @property
+    def _path(self) -> Path:
+        return self._directory / f"metrics-{os.getpid()}.json"
+
+    def _dump(self, snapshot: dict[str, dict]) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        data = {"pid": os.getpid(), "metrics": snapshot}
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, self._path)
+
+    def write(self) -> None:
+        self._dump(self._registry.snapshot())
+
+    def read_all(self) -> dict[int, dict[str, dict]]:
+        gauges = {
+            name for name, metric in self._registry.items() if isinstance(metric, Gauge)
+        }
+        snapshots = {}
+        for path in self._directory.glob("metrics-*.json"):
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            snapshot = data["metrics"]
+            if not _pid_alive(data["pid"]):
+                snapshot = {k: v for k, v in snapshot.items() if k not in gauges}
+            snapshots[data["pid"]] = snapshot
+        return snapshots
+
+    def render(self) -> str:
+        self.write()
+        return self._registry.render(self.read_all())
+
+    # Metrics and collectors change the live values on the event loop, so
+    # snapshots are taken there; only file I/O is handed to a thread.
+
+    async def flush(self) -> None:
+        await asyncio.to_thread(self._dump, self._registry.snapshot())
+
+    async def render_async(self) -> str:
+        await self.flush()
+        snapshots = await asyncio.to_thread(self.read_all)
+        return self._registry.render(snapshots)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.flush()
+            except OSError as exc:
+                logger.warning("Cannot write metrics snapshot: %s", exc)
+            except Exception:
+                logger.exception("Cannot take metrics snapshot")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.write()
+
+
+metrics_store = (
+    MetricsFileStore(
+        metrics,
+        settings.METRICS_MULTIPROC_DIR,
+        interval=settings.METRICS_FLUSH_INTERVAL_S,
+    )
+    if settings.METRICS_MULTIPROC_DIR
+    else None
+)
@@ -0,0 +1,218 @@
+import bisect
+import json
+import math
+from typing import Callable, Iterable, Literal
+
+LabelValues = tuple[str, ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+MultiprocessMode = Literal["liveall", "sum", "max", "min"]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+
+class Counter(_Metric):
+    """Monotonic counter. Updates are plain dict writes on the event loop
+    thread, so no locking is needed."""
+
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def snapshot(self) -> dict:
+        return {json.dumps(k): v for k, v in self.values.items()}
+
+    def render(
+        self, values: dict[LabelValues, float], extra_labels: tuple[str, ...] = ()
+    ) -> list[str]:
+        labelnames = (*self.labelnames, *extra_labels)
+        return [
+            f"{self.name}{_format_labels(labelnames, labels)} "
+            f"{_format_value(value)}"
+            for labels, value in sorted(values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that goes up and down. ``multiprocess_mode`` says how the values
+    of several workers are merged: one series per worker under a ``pid``
+    label ("liveall"), or their "sum", "max" or "min". Gauges of exited
+    workers are dropped in every mode."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self, *args, multiprocess_mode: MultiprocessMode = "liveall", **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.multiprocess_mode = multiprocess_mode
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, labels: LabelValues, value: float) -> None:
+        self.values[labels] = value
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # per label set: [count per bucket..., count above last bucket, sum]
+        self.values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        row = self.values.get(labels)
+        if row is None:
+            row = self.values[labels] = [0] * (len(self.buckets) + 2)
+        row[bisect.bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def snapshot(self) -> dict:
+        return {json.dumps(k): list(v) for k, v in self.values.items()}
+
+    def render(self, values: dict[LabelValues, list[float]]) -> list[str]:
+        lines = []
+        for labels, row in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), row):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    (*self.labelnames, "le"), (*labels, _format_value(bound))
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            base = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{base} {_format_value(row[-1])}")
+            lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def _add(self, metric: _Metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        multiprocess_mode: MultiprocessMode = "liveall",
+    ) -> Gauge:
+        return self._add(
+            Gauge(name, documentation, labelnames, multiprocess_mode=multiprocess_mode)
+        )
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def items(self):
+        return self._metrics.items()
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """``collector`` refreshes gauges right before a snapshot or render."""
+        self._collectors.append(collector)
+
+    def collect(self) -> None:
+        for collector in self._collectors:
+            collector()
+
+    def snapshot(self) -> dict[str, dict]:
+        self.collect()
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def render(self, snapshots: dict[int, dict[str, dict]] | None = None) -> str:
+        """Prometheus text format of this process, or of the workers'
+        ``snapshots`` (keyed by pid) merged."""
+        if snapshots is None:
+            return self._render({0: self.snapshot()}, per_worker=False)
+        return self._render(snapshots, per_worker=True)
+
+    def _render(self, snapshots: dict[int, dict[str, dict]], per_worker: bool) -> str:
+        lines = []
+        for name, metric in self._metrics.items():
+            parts = {pid: snapshot.get(name, {}) for pid, snapshot in snapshots.items()}
+            if (
+                per_worker
+                and isinstance(metric, Gauge)
+                and metric.multiprocess_mode == "liveall"
+            ):
+                merged = {
+                    (*json.loads(key), str(pid)): value
+                    for pid, part in parts.items()
+                    for key, value in part.items()
+                }
+                lines += metric.header() + metric.render(merged, ("pid",))
+                continue
+            merged = self._merge(metric, list(parts.values()))
+            lines += metric.header() + metric.render(merged)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _merge(metric: _Metric, parts: list[dict]) -> dict:
+        if isinstance(metric, Gauge) and metric.multiprocess_mode in ("max", "min"):
+            combine = max if metric.multiprocess_mode == "max" else min
+        else:
+            combine = None
+        merged: dict = {}
+        for part in parts:
+            for key, value in part.items():
+                labels = tuple(json.loads(key))
+                if isinstance(metric, Histogram):
+                    row = merged.setdefault(labels, [0] * len(value))
+                    for index, item in enumerate(value):
+                        row[index] += item
+                elif combine is not None and labels in merged:
+                    merged[labels] = combine(merged[labels], value)
+                else:
+                    merged[labels] = merged.get(labels, 0) + value
+        return merged
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,41 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from db.instrumentation import start_query_stats
+
+QUERY_STATS_SCOPE_KEY = "query_stats"
+
+
+class ServerTimingMiddleware:
+    """Counts the queries of each request and reports them in ``Server-Timing``.
+
+    The stats are also left in the scope under ``QUERY_STATS_SCOPE_KEY`` for
+    the request log. Queries issued after the response headers were sent
+    (streamed responses) only show up in the log.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = scope[QUERY_STATS_SCOPE_KEY] = start_query_stats()
+        start_time = time.perf_counter()
+
+        async def timed_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start_time) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_time_s * 1000:.1f};desc="{stats.count} queries",'
+                    f" app;dur={total_ms:.1f}",
+                )
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
@@ -0,0 +1,52 @@
+import math
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from db.routing import WRITE_MARKER_SCOPE_KEY, WriteMarker
+
+REPLICA_STICKY_COOKIE = "primary_until"
+
+
+class ReadYourWritesMiddleware:
+    """Carries the read-your-writes window between requests in a cookie.
+
+    A request that writes gets ``primary_until=<unix time>`` back, and reads
+    of later requests carrying it go to the primary until then, whichever
+    worker serves them.
+    """
+
+    def __init__(self, app: ASGIApp, window: float):
+        self.app = app
+        self.window = window
+
+    @staticmethod
+    def _primary_until(scope: Scope) -> float:
+        cookies = cookie_parser(Headers(scope=scope).get("cookie", ""))
+        try:
+            return float(cookies.get(REPLICA_STICKY_COOKIE, 0))
+        except ValueError:
+            return 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marker = WriteMarker(self._primary_until(scope))
+        scope[WRITE_MARKER_SCOPE_KEY] = marker
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker.wrote:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{REPLICA_STICKY_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; "
+                    "SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,88 @@
+from typing import Any, Mapping
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from starlette.responses import Response
+
+
+class FastJSONResponse(JSONResponse):
+    """App-wide response class; pydantic-core writes the bytes directly."""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class SchemaResponse:
+    """Serializer for a handler's response schema, compiled once at import.
+
+    Returning ``schema_response(result)`` instead of ``result`` makes FastAPI
+    skip its validate-then-encode pass over ``response_model``. Results that
+    already are instances of the schema are dumped as is (subclasses such as
+    ``User`` are written with the schema's fields only); anything else is
+    validated first.
+    """
+
+    def __init__(self, schema: type[BaseModel], many: bool = False):
+        self._schema = schema
+        self._many = many
+        self._adapter = TypeAdapter(list[schema] if many else schema)
+
+    def _matches(self, content: Any) -> bool:
+        if self._many:
+            return isinstance(content, list) and all(
+                isinstance(item, self._schema) for item in content
+            )
+        return isinstance(content, self._schema)
+
+    def __call__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ) -> Response:
+        if not self._matches(content):
+            content = self._adapter.validate_python(content, from_attributes=True)
+        return Response(
+            self._adapter.dump_json(content),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
+
+
+# clients may keep responses but must revalidate them with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def table_etag(table_name: str, version: int) -> str:
+    return f'"{table_name}-{version}"'
+
+
+def entity_etag(table_name: str, id: Any, version: int) -> str:
+    """ETag of one row: only a 200 for that id hands it out, so a match
+    means the row existed and the table has not changed since."""
+    return f'"{table_name}-{id}-{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str, found: bool = True) -> bool:
+    """If-None-Match uses the weak comparison, so a W/ prefix is ignored.
+
+    ``*`` matches any current representation, so it only counts once the
+    resource is known to exist (``found``).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return found
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
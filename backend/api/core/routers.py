@@ -2,7 +2,9 @@ from fastapi import APIRouter
 
 from api.v1.auth.handlers import router as auth_router
 from api.v1.devices.handlers import router as device_router
+from api.v1.events.handlers import router as events_router
 from api.v1.roles.handlers import router as role_router
+from api.v1.sync.handlers import router as sync_router
 from api.v1.users.handlers import router as user_router
 
 router = APIRouter()
@@ -13,6 +15,8 @@ api_v1.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_v1.include_router(device_router, prefix="/devices", tags=["devices"])
 api_v1.include_router(user_router, prefix="/users", tags=["users"])
 api_v1.include_router(role_router, prefix="/roles", tags=["roles"])
+api_v1.include_router(sync_router, prefix="/sync", tags=["sync"])
+api_v1.include_router(events_router, prefix="/events", tags=["events"])
 
 
 router.include_router(api_v1)
@@ -0,0 +1,54 @@
+from typing import Generic, Iterable, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from api.core.config import get_settings
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: UUID | None = None
+    error: str | None = None
+
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkItemResult]
+
+    @classmethod
+    def from_rows(
+        cls, size: int, created: dict[int, UUID], errors: dict[int, str]
+    ) -> "BulkCreateResult":
+        return cls(
+            created=len(created),
+            failed=len(errors),
+            results=[
+                BulkItemResult(
+                    index=index, id=created.get(index), error=errors.get(index)
+                )
+                for index in range(size)
+            ],
+        )
+
+
+class BatchGetRequest(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=settings.BATCH_GET_MAX_IDS)
+
+
+class BatchGetResult(BaseModel, Generic[T]):
+    items: dict[UUID, T]
+    missing: list[UUID]
+
+    @classmethod
+    def from_found(cls, ids: Iterable[UUID], found: Iterable) -> "BatchGetResult":
+        items = {item.id: item for item in found}
+        return cls(
+            items=items,
+            missing=[id for id in dict.fromkeys(ids) if id not in items],
+        )
@@ -1,15 +1,22 @@
 from typing import cast
 
+from api.core.config import get_settings
 from api.core.exceptions import AppExceptions
+from api.v1.roles.registry import role_registry
+from api.v1.roles.repo_interface import IRoleRepository
 from api.v1.users.repo_interface import IUserRepository
 from api.v1.users.schemas import User
+from config.permissions import permissions_to_mask
 from utils.hashing import Hasher
 from utils.jwt import JWT
 
+settings = get_settings()
+
 
 class AuthService:
-    def __init__(self, repo: IUserRepository):
+    def __init__(self, repo: IUserRepository, role_repo: IRoleRepository):
         self._repo: IUserRepository = repo
+        self._role_repo: IRoleRepository = role_repo
 
     async def _authenticate_user(self, username: str, password: str) -> User:
         if not (
@@ -23,19 +30,21 @@ class AuthService:
             )
         ):
             raise AppExceptions.unauthorized_exception("Incorrect username or password")
-        if not Hasher.verify_password(password, user[0].password):
+        if not await Hasher.verify_password_async(password, user[0].password):
             raise AppExceptions.unauthorized_exception("Incorrect username or password")
         return user[0]
 
     async def create_access_token(self, username: str, password: str):
         user: User = await self._authenticate_user(username, password)
-        permissions = await self._repo.get_user_permissions(user.id)
-        return await JWT.create_jwt_token(
-            data={
-                "sub": user.username,
-                "user_id": str(user.id),
-                "roles": [str(role_id) for role_id in user.role_ids],
-                "permissions": permissions,
-            },
-            token_type="access",
+        permissions = await role_registry.get_permissions(
+            self._role_repo, user.role_ids
         )
+        data = {
+            "sub": user.username,
+            "user_id": str(user.id),
+            "roles": [str(role_id) for role_id in user.role_ids],
+            "pmask": permissions_to_mask(permissions),
+        }
+        if settings.JWT_INCLUDE_PERMISSION_NAMES:
+            data["permissions"] = permissions
+        return await JWT.create_jwt_token(data=data, token_type="access")
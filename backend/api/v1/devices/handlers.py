@@ -1,15 +1,57 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 
+from api.core.config import get_settings
 from api.core.dependencies.jwt_access import permission_required
 from api.core.dependencies.services import get_device_service
-from api.v1.devices.schemas import CreateDevice, ShowDevice, UpdateDevice
+from api.core.responses import (
+    SchemaResponse,
+    entity_etag,
+    etag_headers,
+    etag_matches,
+    not_modified,
+    table_etag,
+)
+from api.core.schemas import BatchGetRequest, BatchGetResult, BulkCreateResult
+from api.v1.devices.schemas import (
+    BulkCreateDevices,
+    CreateDevice,
+    ShowDevice,
+    UpdateDevice,
+)
 from api.v1.devices.service import DeviceService
 from config.permissions import Permissions
+from utils.export import EXPORT_MEDIA_TYPES, ExportFormat, export_rows
+from utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
 
 router = APIRouter()
 
+settings = get_settings()
+
+show_device = SchemaResponse(ShowDevice)
+show_devices = SchemaResponse(ShowDevice, many=True)
+show_device_batch = SchemaResponse(BatchGetResult[ShowDevice])
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[permission_required([Permissions.GET_DEVICES])],
+)
+async def export_devices(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    device_service: DeviceService = Depends(get_device_service),
+) -> StreamingResponse:
+    return StreamingResponse(
+        export_rows(device_service.export_devices(), ShowDevice, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="devices.{export_format}"'
+        },
+    )
+
 
 @router.get(
     "/{device_id}",
@@ -18,9 +60,16 @@ router = APIRouter()
 )
 async def get_device(
     device_id: UUID,
+    if_none_match: str | None = Header(None),
     device_service: DeviceService = Depends(get_device_service),
-) -> ShowDevice:
-    return await device_service.get_device_by_id(device_id)
+) -> Response:
+    etag = entity_etag("devices", device_id, await device_service.get_version())
+    if etag_matches(if_none_match, etag, found=False):
+        return not_modified(etag)
+    device = await device_service.get_device_by_id(device_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return show_device(device, headers=etag_headers(etag))
 
 
 @router.post(
@@ -31,8 +80,33 @@ async def get_device(
 async def create_device(
     body: CreateDevice,
     device_service: DeviceService = Depends(get_device_service),
-) -> ShowDevice:
-    return await device_service.create_device_in_database(body)
+) -> Response:
+    return show_device(await device_service.create_device_in_database(body))
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResult,
+    dependencies=[permission_required([Permissions.CREATE_DEVICE])],
+)
+async def create_devices_in_bulk(
+    body: BulkCreateDevices,
+    device_service: DeviceService = Depends(get_device_service),
+) -> BulkCreateResult:
+    return await device_service.create_devices_in_bulk(body.items)
+
+
+@router.post(
+    "/batch-get",
+    response_model=BatchGetResult[ShowDevice],
+    dependencies=[permission_required([Permissions.GET_DEVICES])],
+)
+async def get_devices_by_ids(
+    body: BatchGetRequest,
+    device_service: DeviceService = Depends(get_device_service),
+) -> Response:
+    devices = await device_service.get_devices_by_ids(body.ids)
+    return show_device_batch(BatchGetResult.from_found(body.ids, devices))
 
 
 @router.patch(
@@ -44,9 +118,9 @@ async def update_device(
     device_id: UUID,
     body: UpdateDevice,
     device_service: DeviceService = Depends(get_device_service),
-) -> ShowDevice:
-    device = await device_service.get_device_by_id(device_id)
-    return await device_service.update_device(device, body)
+) -> Response:
+    device = await device_service.get_device_by_id(device_id, for_update=True)
+    return show_device(await device_service.update_device(device, body))
 
 
 @router.delete(
@@ -67,9 +141,21 @@ async def delete_device(
 )
 async def get_devices_by_name_or_all(
     device_name: str | None = None,
+    after: str | None = None,
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    if_none_match: str | None = Header(None),
     device_service: DeviceService = Depends(get_device_service),
-) -> list[ShowDevice]:
-    return await device_service.get_device_by_name_or_all(device_name)
+) -> Response:
+    etag = table_etag("devices", await device_service.get_version())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    devices = await device_service.get_device_by_name_or_all(
+        device_name, after=decode_cursor(after), limit=limit
+    )
+    headers = etag_headers(etag)
+    if not device_name and (cursor := next_cursor(devices, limit)):
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return show_devices(devices, headers=headers)
 
 
 @router.get(
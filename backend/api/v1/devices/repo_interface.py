@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 from uuid import UUID
 
 from api.v1.devices.schemas import CreateDevice, Device, UpdateDevice
@@ -23,14 +24,50 @@ class IDeviceRepository(ABC):
 
     @abstractmethod
     async def get_by_name(
-        self, name: str, exact_match: bool = False, case_sensitive: bool = False
+        self,
+        name: str,
+        exact_match: bool = False,
+        case_sensitive: bool = False,
+        limit: int | None = None,
     ) -> list[Device]:
         pass
 
     @abstractmethod
-    async def get_all(self) -> list[Device]:
+    async def get_by_ids(self, ids: list[UUID]) -> list[Device]:
+        """The ones of ``ids`` that exist, in no particular order."""
+        pass
+
+    @abstractmethod
+    async def get_all(
+        self, after: UUID | None = None, limit: int | None = None
+    ) -> list[Device]:
+        pass
+
+    @abstractmethod
+    def stream_all(self) -> AsyncIterator[Device]:
         pass
 
     @abstractmethod
     async def get_by_android_id(self, android_id: str) -> Device | None:
         pass
+
+    @abstractmethod
+    async def create_many(self, infos: list[CreateDevice]) -> list[Device | None]:
+        """Insert all devices in one statement.
+
+        Returns the created devices in input order, None where a row hit a
+        unique constraint.
+        """
+        pass
+
+    @abstractmethod
+    async def get_taken_names_and_android_ids(
+        self, names: list[str], android_ids: list[str]
+    ) -> tuple[set[str], set[str]]:
+        """Lower-cased names and normalized android_ids that are already taken."""
+        pass
+
+    @abstractmethod
+    async def get_version(self) -> int:
+        """Counter bumped by every write to the table; used for ETags."""
+        pass
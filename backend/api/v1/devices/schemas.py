@@ -2,15 +2,18 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from api.core.config import get_settings
+
+settings = get_settings()
+
 
 class TundeModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class Device(TundeModel):
-    id: UUID
-    name: str
-    android_id: str
+def normalize_android_id(android_id: str) -> str:
+    """The form android_id is stored in; the database applies it on write."""
+    return android_id.strip().lower()
 
 
 class ShowDevice(TundeModel):
@@ -19,11 +22,19 @@ class ShowDevice(TundeModel):
     android_id: str
 
 
+class Device(ShowDevice):
+    pass
+
+
 class CreateDevice(BaseModel):
     name: str = Field(min_length=1, max_length=255)
     android_id: str = Field(min_length=1, max_length=255)
 
 
+class BulkCreateDevices(BaseModel):
+    items: list[CreateDevice] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
 class UpdateDevice(BaseModel):
     name: str | None = None
     android_id: str | None = None
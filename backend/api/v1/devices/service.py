@@ -1,40 +1,96 @@
+from typing import AsyncIterator
 from uuid import UUID
 
 from api.core.exceptions import AppExceptions
+from api.core.schemas import BulkCreateResult
 from api.v1.devices.repo_interface import IDeviceRepository
-from api.v1.devices.schemas import CreateDevice, Device
-from db.db_exceptions import DBException
+from api.v1.devices.schemas import CreateDevice, Device, normalize_android_id
+from db.db_exceptions import DBException, UniqueViolation
+from db.routing import primary_only
 
 
 class DeviceService:
     def __init__(self, device_repository_interface: IDeviceRepository):
         self._repo: IDeviceRepository = device_repository_interface
 
-    async def get_device_by_id(self, device_id: UUID) -> Device:
+    async def get_device_by_id(
+        self, device_id: UUID, for_update: bool = False
+    ) -> Device:
+        """``for_update`` reads from the primary: the device is about to be written."""
         try:
-            device: Device | None = await self._repo.get_by_id(device_id)
+            with primary_only(for_update):
+                device: Device | None = await self._repo.get_by_id(device_id)
             if device is None:
                 raise AppExceptions.not_found_exception("Device with this id not found")
             return device
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
+    async def get_devices_by_ids(self, device_ids: list[UUID]) -> list[Device]:
+        try:
+            return await self._repo.get_by_ids(device_ids)
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
+
     async def create_device_in_database(self, device_info: CreateDevice) -> Device:
         try:
-            if (
-                await self._repo.get_by_name(
-                    device_info.name, exact_match=True, case_sensitive=False
-                )
-                != []
-            ):
+            return await self._repo.create(device_info)
+        except UniqueViolation as exc:
+            if exc.field == "name":
                 raise AppExceptions.bad_request_exception(
                     f"Device with name {device_info.name} already exists"
                 )
-            if await self._repo.get_by_android_id(device_info.android_id) is not None:
-                raise AppExceptions.bad_request_exception(
-                    f"Device with android_id {device_info.android_id} already exists"
+            raise AppExceptions.bad_request_exception(
+                f"Device with android_id {device_info.android_id} already exists"
+            )
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
+
+    async def create_devices_in_bulk(
+        self, items: list[CreateDevice]
+    ) -> BulkCreateResult:
+        try:
+            taken_names, taken_android_ids = (
+                await self._repo.get_taken_names_and_android_ids(
+                    [item.name for item in items],
+                    [item.android_id for item in items],
                 )
-            return await self._repo.create(device_info)
+            )
+            errors: dict[int, str] = {}
+            # only items that will be created claim their name and android_id
+            batch_names: set[str] = set()
+            batch_android_ids: set[str] = set()
+            for index, item in enumerate(items):
+                name = item.name.lower()
+                android_id = normalize_android_id(item.android_id)
+                if name in taken_names:
+                    errors[index] = f"Device with name {item.name} already exists"
+                elif android_id in taken_android_ids:
+                    errors[index] = (
+                        f"Device with android_id {item.android_id} already exists"
+                    )
+                elif name in batch_names:
+                    errors[index] = f"Device with name {item.name} is repeated in batch"
+                elif android_id in batch_android_ids:
+                    errors[index] = (
+                        f"Device with android_id {item.android_id} is repeated in batch"
+                    )
+                else:
+                    batch_names.add(name)
+                    batch_android_ids.add(android_id)
+
+            to_create = [index for index in range(len(items)) if index not in errors]
+            created: dict[int, UUID] = {}
+            if to_create:
+                devices = await self._repo.create_many([items[i] for i in to_create])
+                for index, device in zip(to_create, devices):
+                    if device is None:
+                        errors[index] = (
+                            "Device with this name or android_id already exists"
+                        )
+                    else:
+                        created[index] = device.id
+            return BulkCreateResult.from_rows(len(items), created, errors)
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
@@ -44,44 +100,38 @@ class DeviceService:
                 raise AppExceptions.validation_exception(
                     "At least one parameter must be defined"
                 )
-            if (
-                body.name
-                and body.name != device.name
-                and (
-                    await self._repo.get_by_name(
-                        body.name, exact_match=True, case_sensitive=False
-                    )
-                    != []
-                )
-            ):
+            return await self._repo.update(device, body)
+        except UniqueViolation as exc:
+            if exc.field == "name":
                 raise AppExceptions.bad_request_exception(
                     f"Device with name {body.name} already exists."
                 )
-            if (
-                body.android_id
-                and body.android_id != device.android_id
-                and await self._repo.get_by_android_id(body.android_id) is not None
-            ):
-                raise AppExceptions.bad_request_exception(
-                    "Device with this android_id already exists"
-                )
-            return await self._repo.update(device, body)
+            raise AppExceptions.bad_request_exception(
+                "Device with this android_id already exists"
+            )
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
     async def delete_device_by_id(self, device_id: UUID) -> UUID:
         try:
-            if await self._repo.get_by_id(device_id) is None:
+            with primary_only():
+                device: Device | None = await self._repo.get_by_id(device_id)
+            if device is None:
                 raise AppExceptions.not_found_exception("Device with this id not found")
             return await self._repo.delete(device_id)
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
-    async def get_device_by_name_or_all(self, device_name: str) -> list[Device]:
+    async def get_device_by_name_or_all(
+        self,
+        device_name: str | None,
+        after: UUID | None = None,
+        limit: int | None = None,
+    ) -> list[Device]:
         try:
             if device_name:
-                return await self._repo.get_by_name(device_name)
-            return await self._repo.get_all()
+                return await self._repo.get_by_name(device_name, limit=limit)
+            return await self._repo.get_all(after=after, limit=limit)
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
@@ -90,3 +140,13 @@ class DeviceService:
             return await self._repo.get_by_android_id(android_id)
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
+
+    async def get_version(self) -> int:
+        try:
+            return await self._repo.get_version()
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
+
+    async def export_devices(self) -> AsyncIterator[Device]:
+        async for item in self._repo.stream_all():
+            yield item
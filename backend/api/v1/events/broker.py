@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator
+
+from api.core.config import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "entity_changes"
+
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+def sse_frame(event: str, data: str) -> bytes:
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
+
+EVICTED_FRAME = sse_frame("evicted", "{}")
+RESYNC_FRAME = sse_frame("resync", "{}")
+
+
+class Subscriber:
+    __slots__ = ("queue",)
+
+    def __init__(self, queue_size: int):
+        # None tells the stream to end
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(queue_size)
+
+
+class EventBroker:
+    """Fans ``entity_changes`` notifications out to this worker's SSE clients.
+
+    Notifications arrive over the worker's single LISTEN connection (see
+    db.listener). Each one is encoded once and offered to every client
+    without waiting: a client whose queue is full is evicted with an
+    ``evicted`` event, and is expected to catch up through /v1/sync and
+    reconnect. A ``resync`` event goes out after the LISTEN connection is
+    re-established, since notifications may have been lost meanwhile.
+    """
+
+    def __init__(self, queue_size: int, max_subscribers: int):
+        self._queue_size = queue_size
+        self._max_subscribers = max_subscribers
+        self._subscribers: set[Subscriber] = set()
+        self.published = 0
+        self.evictions = 0
+
+    def is_full(self) -> bool:
+        return len(self._subscribers) >= self._max_subscribers
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self._queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    @staticmethod
+    def _replace_queued(subscriber: Subscriber, item: bytes | None) -> None:
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(item)
+
+    def _broadcast(self, frame: bytes) -> None:
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self.unsubscribe(subscriber)
+                self._replace_queued(subscriber, EVICTED_FRAME)
+                self.evictions += 1
+
+    def publish(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)["table"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Malformed %s payload: %r", EVENTS_CHANNEL, payload)
+            return
+        self.published += 1
+        self._broadcast(sse_frame(event, payload))
+
+    def resync(self) -> None:
+        self._broadcast(RESYNC_FRAME)
+
+    def close(self) -> None:
+        for subscriber in list(self._subscribers):
+            self.unsubscribe(subscriber)
+            self._replace_queued(subscriber, None)
+
+    async def stream(
+        self, subscriber: Subscriber, heartbeat: float
+    ) -> AsyncIterator[bytes]:
+        """SSE body for ``subscriber``; unsubscribes it when the body ends.
+
+        A subscriber whose body never starts is evicted once its queue fills.
+        """
+        try:
+            # sent right away so clients and proxies see the stream open
+            yield HEARTBEAT_FRAME
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT_FRAME
+                    continue
+                if frame is None:
+                    return
+                yield frame
+                if frame is EVICTED_FRAME:
+                    return
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "evictions": self.evictions,
+        }
+
+
+event_broker = EventBroker(
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+)
@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from api.core.config import get_settings
+from api.core.dependencies.jwt_access import permission_required
+from api.core.exceptions import AppExceptions
+from api.v1.events.broker import event_broker
+from config.permissions import Permissions
+
+router = APIRouter()
+
+settings = get_settings()
+
+
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    dependencies=[
+        permission_required([Permissions.GET_USERS]),
+        permission_required([Permissions.GET_ROLES]),
+        permission_required([Permissions.GET_DEVICES]),
+    ],
+)
+async def stream_events() -> StreamingResponse:
+    """Server-sent events for role, device and user permission changes.
+
+    Event names are the table (``roles``, ``devices``, ``users``) and the
+    data is ``{"table", "op", "id"}``. After ``resync`` or ``evicted``,
+    catch up through /v1/sync.
+    """
+    if event_broker.is_full():
+        raise AppExceptions.service_unavailable_exception("Too many event subscribers.")
+    # subscribed here, not when the body starts, so the cap holds for bursts
+    subscriber = event_broker.subscribe()
+    return StreamingResponse(
+        event_broker.stream(subscriber, settings.EVENTS_HEARTBEAT_S),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,15 +1,37 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 
+from api.core.config import get_settings
 from api.core.dependencies.jwt_access import permission_required
-from api.core.dependencies.services import get_role_service
+from api.core.dependencies.services import get_role_service, get_user_service
+from api.core.responses import (
+    SchemaResponse,
+    entity_etag,
+    etag_headers,
+    etag_matches,
+    not_modified,
+    table_etag,
+)
+from api.core.schemas import BatchGetRequest, BatchGetResult
 from api.v1.roles.schemas import CreateRole, ShowRole, UpdateRole
 from api.v1.roles.service import RoleService
+from api.v1.users.schemas import ShowUser
+from api.v1.users.service import UserService
 from config.permissions import Permissions
+from utils.export import EXPORT_MEDIA_TYPES, ExportFormat, export_rows
+from utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
 
 router = APIRouter()
 
+settings = get_settings()
+
+show_role = SchemaResponse(ShowRole)
+show_roles = SchemaResponse(ShowRole, many=True)
+show_role_batch = SchemaResponse(BatchGetResult[ShowRole])
+show_users = SchemaResponse(ShowUser, many=True)
+
 
 @router.get(
     "/permissions",
@@ -19,6 +41,24 @@ async def get_permissions() -> list[str]:
     return [permission for permission in Permissions]
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[permission_required([Permissions.GET_ROLES])],
+)
+async def export_roles(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    role_service: RoleService = Depends(get_role_service),
+) -> StreamingResponse:
+    return StreamingResponse(
+        export_rows(role_service.export_roles(), ShowRole, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="roles.{export_format}"'
+        },
+    )
+
+
 @router.get(
     "/{role_id}",
     response_model=ShowRole,
@@ -26,9 +66,39 @@ async def get_permissions() -> list[str]:
 )
 async def get_role(
     role_id: UUID,
+    if_none_match: str | None = Header(None),
     role_service: RoleService = Depends(get_role_service),
-) -> ShowRole:
-    return await role_service.get_role_by_id(role_id)
+) -> Response:
+    etag = entity_etag("roles", role_id, await role_service.get_version())
+    if etag_matches(if_none_match, etag, found=False):
+        return not_modified(etag)
+    role = await role_service.get_role_by_id(role_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return show_role(role, headers=etag_headers(etag))
+
+
+@router.get(
+    "/{role_id}/users",
+    response_model=list[ShowUser],
+    dependencies=[
+        permission_required([Permissions.GET_ROLES]),
+        permission_required([Permissions.GET_USERS]),
+    ],
+)
+async def get_role_users(
+    role_id: UUID,
+    after: str | None = None,
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
+    users = await user_service.get_users_by_role(
+        role_id, after=decode_cursor(after), limit=limit
+    )
+    headers = {}
+    if cursor := next_cursor(users, limit):
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return show_users(users, headers=headers)
 
 
 @router.post(
@@ -39,8 +109,21 @@ async def get_role(
 async def create_role(
     body: CreateRole,
     role_service: RoleService = Depends(get_role_service),
-) -> ShowRole:
-    return await role_service.create_role_in_database(body)
+) -> Response:
+    return show_role(await role_service.create_role_in_database(body))
+
+
+@router.post(
+    "/batch-get",
+    response_model=BatchGetResult[ShowRole],
+    dependencies=[permission_required([Permissions.GET_ROLES])],
+)
+async def get_roles_by_ids(
+    body: BatchGetRequest,
+    role_service: RoleService = Depends(get_role_service),
+) -> Response:
+    roles = await role_service.get_roles_by_ids(body.ids)
+    return show_role_batch(BatchGetResult.from_found(body.ids, roles))
 
 
 @router.patch(
@@ -52,9 +135,9 @@ async def update_role(
     role_id: UUID,
     body: UpdateRole,
     role_service: RoleService = Depends(get_role_service),
-) -> ShowRole:
-    role = await role_service.get_role_by_id(role_id)
-    return await role_service.update_role(role, body)
+) -> Response:
+    role = await role_service.get_role_by_id(role_id, for_update=True)
+    return show_role(await role_service.update_role(role, body))
 
 
 @router.delete(
@@ -75,6 +158,18 @@ async def delete_role(
 )
 async def get_roles_by_name_or_all(
     role_name: str | None = None,
+    after: str | None = None,
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    if_none_match: str | None = Header(None),
     role_service: RoleService = Depends(get_role_service),
-) -> ShowRole:
-    return await role_service.get_role_by_name_or_all(role_name)
+) -> Response:
+    etag = table_etag("roles", await role_service.get_version())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    roles = await role_service.get_role_by_name_or_all(
+        role_name, after=decode_cursor(after), limit=limit
+    )
+    headers = etag_headers(etag)
+    if not role_name and (cursor := next_cursor(roles, limit)):
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return show_roles(roles, headers=headers)
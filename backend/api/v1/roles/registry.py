@@ -0,0 +1,90 @@
+import time
+from typing import Iterable
+from uuid import UUID
+
+from api.core.config import get_settings
+from api.v1.roles.repo_interface import IRoleRepository
+from api.v1.roles.schemas import Role
+from db.routing import primary_only
+
+settings = get_settings()
+
+ROLES_CHANNEL = "roles_changed"
+
+
+class RoleRegistry:
+    """Per-worker snapshot of the roles table.
+
+    Roles change rarely, so lookups are served from memory. The snapshot is
+    dropped when a ``roles_changed`` notification arrives (see db.listener),
+    when this worker writes a role, or after ROLE_CACHE_TTL_S as a fallback for
+    notifications lost while the listener was reconnecting.
+    """
+
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._roles: dict[UUID, Role] = {}
+        self._loaded_version: int | None = None
+        self._loaded_at = 0.0
+        self.version = 0
+        self.hits = 0
+        self.reloads = 0
+
+    def invalidate(self, *_) -> None:
+        self.version += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_version == self.version
+            and time.monotonic() - self._loaded_at < self._ttl
+        )
+
+    async def _reload(self, repo: IRoleRepository) -> None:
+        version = self.version
+        with primary_only():
+            roles = await repo.get_all()
+        self._roles = {role.id: role for role in roles}
+        self._loaded_at = time.monotonic()
+        self._loaded_version = version
+        self.reloads += 1
+
+    async def get_all(self, repo: IRoleRepository) -> dict[UUID, Role]:
+        if self._is_fresh():
+            self.hits += 1
+        else:
+            await self._reload(repo)
+        return self._roles
+
+    async def resolve(
+        self, repo: IRoleRepository, role_ids: Iterable[UUID] | None
+    ) -> dict[UUID, Role]:
+        """Roles for ``role_ids`` that exist; unknown ids force one reload."""
+        role_ids = list(role_ids or [])
+        roles = await self.get_all(repo)
+        if any(role_id not in roles for role_id in role_ids):
+            await self._reload(repo)
+            roles = self._roles
+        return {role_id: roles[role_id] for role_id in role_ids if role_id in roles}
+
+    async def get_permissions(
+        self, repo: IRoleRepository, role_ids: Iterable[UUID] | None
+    ) -> list[str]:
+        roles = await self.resolve(repo, role_ids)
+        return list({perm for role in roles.values() for perm in role.permissions})
+
+    async def has_super_role(
+        self, repo: IRoleRepository, role_ids: Iterable[UUID] | None
+    ) -> bool:
+        roles = await self.resolve(repo, role_ids)
+        return any(role.name == settings.SUPER_ROLE_NAME for role in roles.values())
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "version": self.version,
+            "size": len(self._roles),
+            "hits": self.hits,
+            "reloads": self.reloads,
+        }
+
+
+role_registry = RoleRegistry(ttl=settings.ROLE_CACHE_TTL_S)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 from uuid import UUID
 
 from api.v1.roles.schemas import CreateRole, Role, UpdateRole
@@ -23,10 +24,30 @@ class IRoleRepository(ABC):
 
     @abstractmethod
     async def get_by_name(
-        self, name: str, exact_match: bool = False, case_sensitive: bool = False
+        self,
+        name: str,
+        exact_match: bool = False,
+        case_sensitive: bool = False,
+        limit: int | None = None,
     ) -> list[Role]:
         pass
 
     @abstractmethod
-    async def get_all(self) -> list[Role]:
+    async def get_by_ids(self, ids: list[UUID]) -> list[Role]:
+        """The ones of ``ids`` that exist, in no particular order."""
+        pass
+
+    @abstractmethod
+    async def get_all(
+        self, after: UUID | None = None, limit: int | None = None
+    ) -> list[Role]:
+        pass
+
+    @abstractmethod
+    def stream_all(self) -> AsyncIterator[Role]:
+        pass
+
+    @abstractmethod
+    async def get_version(self) -> int:
+        """Counter bumped by every write to the table; used for ETags."""
         pass
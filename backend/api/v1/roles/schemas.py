@@ -7,16 +7,14 @@ class TundeModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class Role(TundeModel):
+class ShowRole(TundeModel):
     id: UUID
     name: str
     permissions: list[str] = []
 
 
-class ShowRole(TundeModel):
-    id: UUID
-    name: str
-    permissions: list[str] = []
+class Role(ShowRole):
+    pass
 
 
 class CreateRole(BaseModel):
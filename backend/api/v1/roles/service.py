@@ -1,10 +1,13 @@
+from typing import AsyncIterator
 from uuid import UUID
 
 from api.core.config import get_settings
 from api.core.exceptions import AppExceptions
+from api.v1.roles.registry import role_registry
 from api.v1.roles.repo_interface import IRoleRepository
 from api.v1.roles.schemas import CreateRole, Role
-from db.db_exceptions import DBException
+from db.db_exceptions import DBException, UniqueViolation
+from db.routing import primary_only
 
 settings = get_settings()
 
@@ -13,31 +16,36 @@ class RoleService:
     def __init__(self, role_repository_interface: IRoleRepository):
         self._repo: IRoleRepository = role_repository_interface
 
-    async def get_role_by_id(self, role_id: UUID) -> Role:
+    async def get_role_by_id(self, role_id: UUID, for_update: bool = False) -> Role:
+        """``for_update`` reads from the primary: the role is about to be written."""
         try:
-            role: Role | None = await self._repo.get_by_id(role_id)
+            with primary_only(for_update):
+                role: Role | None = await self._repo.get_by_id(role_id)
             if role is None:
                 raise AppExceptions.not_found_exception("Role with this id not found")
             return role
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
+    async def get_roles_by_ids(self, role_ids: list[UUID]) -> list[Role]:
+        try:
+            return await self._repo.get_by_ids(role_ids)
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
+
     async def create_role_in_database(self, role_info: CreateRole) -> Role:
         try:
             if role_info.name.lower() == settings.SUPER_ROLE_NAME.lower():
                 raise AppExceptions.forbidden_exception(
                     "Role with this name is not allowed to create"
                 )
-            if (
-                await self._repo.get_by_name(
-                    role_info.name, exact_match=True, case_sensitive=False
-                )
-                != []
-            ):
-                raise AppExceptions.bad_request_exception(
-                    f"Role with name {role_info.name} already exists."
-                )
-            return await self._repo.create(role_info)
+            created = await self._repo.create(role_info)
+            role_registry.invalidate()
+            return created
+        except UniqueViolation:
+            raise AppExceptions.bad_request_exception(
+                f"Role with name {role_info.name} already exists."
+            )
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
@@ -48,44 +56,56 @@ class RoleService:
                     "Super role is not allowed to perform this action"
                 )
 
-            if (
-                body.name
-                and body.name != role.name
-                and await self._repo.get_by_name(
-                    body.name, exact_match=True, case_sensitive=False
-                )
-                != []
-            ):
-                raise AppExceptions.bad_request_exception(
-                    f"Role with name {body.name} already exists."
-                )
-
             role_info = body.model_dump(exclude_none=True)
             if not role_info:
                 raise AppExceptions.validation_exception(
                     "At least one parameter must be defined"
                 )
-            return await self._repo.update(role, body)
+            updated = await self._repo.update(role, body)
+            role_registry.invalidate()
+            return updated
+        except UniqueViolation:
+            raise AppExceptions.bad_request_exception(
+                f"Role with name {body.name} already exists."
+            )
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
     async def delete_role_by_id(self, role_id: UUID) -> UUID:
         try:
-            role: Role | None = await self._repo.get_by_id(role_id)
+            with primary_only():
+                role: Role | None = await self._repo.get_by_id(role_id)
             if role is None:
                 raise AppExceptions.not_found_exception("Role with this id not found")
             if role.name == settings.SUPER_ROLE_NAME:
                 raise AppExceptions.forbidden_exception(
                     "Super role is not allowed to perform this action"
                 )
-            return await self._repo.delete(role_id)
+            deleted_id = await self._repo.delete(role_id)
+            role_registry.invalidate()
+            return deleted_id
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
-    async def get_role_by_name_or_all(self, role_name: str) -> list[Role]:
+    async def get_role_by_name_or_all(
+        self,
+        role_name: str | None,
+        after: UUID | None = None,
+        limit: int | None = None,
+    ) -> list[Role]:
         try:
             if role_name:
-                return await self._repo.get_by_name(role_name)
-            return await self._repo.get_all()
+                return await self._repo.get_by_name(role_name, limit=limit)
+            return await self._repo.get_all(after=after, limit=limit)
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
+
+    async def get_version(self) -> int:
+        try:
+            return await self._repo.get_version()
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
+
+    async def export_roles(self) -> AsyncIterator[Role]:
+        async for item in self._repo.stream_all():
+            yield item
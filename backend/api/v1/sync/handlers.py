@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query, Response
+
+from api.core.config import get_settings
+from api.core.dependencies.jwt_access import permission_required
+from api.core.dependencies.services import get_sync_service
+from api.core.responses import SchemaResponse
+from api.v1.sync.schemas import SyncChanges, SyncPosition
+from api.v1.sync.service import SyncService
+from config.permissions import Permissions
+from utils.pagination import decode_sync_token, encode_sync_token
+
+router = APIRouter()
+
+settings = get_settings()
+
+show_changes = SchemaResponse(SyncChanges)
+
+
+@router.get(
+    "/",
+    response_model=SyncChanges,
+    dependencies=[
+        permission_required([Permissions.GET_USERS]),
+        permission_required([Permissions.GET_ROLES]),
+        permission_required([Permissions.GET_DEVICES]),
+    ],
+)
+async def get_changes(
+    since: str | None = None,
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    sync_service: SyncService = Depends(get_sync_service),
+) -> Response:
+    """Users, roles and devices changed since the ``since`` token.
+
+    Without ``since`` only a token is returned: take it before the initial
+    full listing, then pass each ``next_token`` back. Changed rows come with
+    their current state and deleted ones as ids; ``has_more`` asks for
+    another call right away.
+    """
+    position = decode_sync_token(since)
+    changes = await sync_service.get_changes(
+        SyncPosition(*position) if position else None, limit
+    )
+    return show_changes(
+        SyncChanges(
+            users=changes.users,
+            roles=changes.roles,
+            devices=changes.devices,
+            deleted=changes.deleted,
+            next_token=encode_sync_token(changes.position),
+            has_more=changes.has_more,
+        )
+    )
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+from api.v1.sync.schemas import ChangeSet, SyncPosition
+
+
+class ISyncRepository(ABC):
+    @abstractmethod
+    async def get_current_position(self) -> SyncPosition:
+        """Position before every change not yet visible to all transactions."""
+        pass
+
+    @abstractmethod
+    async def get_changes(self, after: SyncPosition, limit: int) -> ChangeSet:
+        """Rows changed after ``after``, from at most ``limit`` log entries.
+
+        Entries of transactions that may still commit are left for the next
+        call, so a position never skips a change.
+        """
+        pass
@@ -0,0 +1,41 @@
+from typing import NamedTuple
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from api.v1.devices.schemas import Device, ShowDevice
+from api.v1.roles.schemas import Role, ShowRole
+from api.v1.users.schemas import ShowUser, User
+
+
+class SyncPosition(NamedTuple):
+    """Place in the change log: the writing transaction, then the entry."""
+
+    xid: int
+    change_id: int
+
+
+class Tombstones(BaseModel):
+    users: list[UUID] = []
+    roles: list[UUID] = []
+    devices: list[UUID] = []
+
+
+class ChangeSet(BaseModel):
+    """Current state of every row changed after a position, up to ``position``."""
+
+    users: list[User] = []
+    roles: list[Role] = []
+    devices: list[Device] = []
+    deleted: Tombstones = Tombstones()
+    position: SyncPosition
+    has_more: bool = False
+
+
+class SyncChanges(BaseModel):
+    users: list[ShowUser]
+    roles: list[ShowRole]
+    devices: list[ShowDevice]
+    deleted: Tombstones
+    next_token: str
+    has_more: bool
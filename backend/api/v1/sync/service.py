@@ -0,0 +1,17 @@
+from api.core.exceptions import AppExceptions
+from api.v1.sync.repo_interface import ISyncRepository
+from api.v1.sync.schemas import ChangeSet, SyncPosition
+from db.db_exceptions import DBException
+
+
+class SyncService:
+    def __init__(self, sync_repository_interface: ISyncRepository):
+        self._repo: ISyncRepository = sync_repository_interface
+
+    async def get_changes(self, since: SyncPosition | None, limit: int) -> ChangeSet:
+        try:
+            if since is None:
+                return ChangeSet(position=await self._repo.get_current_position())
+            return await self._repo.get_changes(since, limit)
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
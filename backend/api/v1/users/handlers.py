@@ -1,15 +1,52 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 
+from api.core.config import get_settings
 from api.core.dependencies.jwt_access import permission_required
 from api.core.dependencies.services import get_user_service
-from api.v1.users.schemas import CreateUser, ShowUser, UpdateUser
+from api.core.responses import (
+    SchemaResponse,
+    entity_etag,
+    etag_headers,
+    etag_matches,
+    not_modified,
+    table_etag,
+)
+from api.core.schemas import BatchGetRequest, BatchGetResult, BulkCreateResult
+from api.v1.users.schemas import BulkCreateUsers, CreateUser, ShowUser, UpdateUser
 from api.v1.users.service import UserService
 from config.permissions import Permissions
+from utils.export import EXPORT_MEDIA_TYPES, ExportFormat, export_rows
+from utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
 
 router = APIRouter()
 
+settings = get_settings()
+
+show_user = SchemaResponse(ShowUser)
+show_users = SchemaResponse(ShowUser, many=True)
+show_user_batch = SchemaResponse(BatchGetResult[ShowUser])
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[permission_required([Permissions.GET_USERS])],
+)
+async def export_users(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    user_service: UserService = Depends(get_user_service),
+) -> StreamingResponse:
+    return StreamingResponse(
+        export_rows(user_service.export_users(), ShowUser, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="users.{export_format}"'
+        },
+    )
+
 
 @router.get(
     "/{user_id}",
@@ -18,9 +55,16 @@ router = APIRouter()
 )
 async def get_user(
     user_id: UUID,
+    if_none_match: str | None = Header(None),
     user_service: UserService = Depends(get_user_service),
-) -> ShowUser:
-    return await user_service.get_user_by_id(user_id)
+) -> Response:
+    etag = entity_etag("users", user_id, await user_service.get_version())
+    if etag_matches(if_none_match, etag, found=False):
+        return not_modified(etag)
+    user = await user_service.get_user_by_id(user_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return show_user(user, headers=etag_headers(etag))
 
 
 @router.post(
@@ -31,8 +75,33 @@ async def get_user(
 async def create_user(
     body: CreateUser,
     user_service: UserService = Depends(get_user_service),
-) -> ShowUser:
-    return await user_service.create_user_in_database(body)
+) -> Response:
+    return show_user(await user_service.create_user_in_database(body))
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResult,
+    dependencies=[permission_required([Permissions.CREATE_USER])],
+)
+async def create_users_in_bulk(
+    body: BulkCreateUsers,
+    user_service: UserService = Depends(get_user_service),
+) -> BulkCreateResult:
+    return await user_service.create_users_in_bulk(body.items)
+
+
+@router.post(
+    "/batch-get",
+    response_model=BatchGetResult[ShowUser],
+    dependencies=[permission_required([Permissions.GET_USERS])],
+)
+async def get_users_by_ids(
+    body: BatchGetRequest,
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
+    users = await user_service.get_users_by_ids(body.ids)
+    return show_user_batch(BatchGetResult.from_found(body.ids, users))
 
 
 @router.patch(
@@ -44,9 +113,9 @@ async def update_user(
     user_id: UUID,
     body: UpdateUser,
     user_service: UserService = Depends(get_user_service),
-) -> ShowUser:
-    user = await user_service.get_user_by_id(user_id)
-    return await user_service.update_user(user, body)
+) -> Response:
+    user = await user_service.get_user_by_id(user_id, for_update=True)
+    return show_user(await user_service.update_user(user, body))
 
 
 @router.delete(
@@ -67,6 +136,18 @@ async def delete_user(
 )
 async def get_users_by_name_or_all(
     name: str | None = None,
+    after: str | None = None,
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    if_none_match: str | None = Header(None),
     user_service: UserService = Depends(get_user_service),
-) -> ShowUser:
-    return await user_service.get_user_by_name_or_all(name)
+) -> Response:
+    etag = table_etag("users", await user_service.get_version())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    users = await user_service.get_user_by_name_or_all(
+        name, after=decode_cursor(after), limit=limit
+    )
+    headers = etag_headers(etag)
+    if not name and (cursor := next_cursor(users, limit)):
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return show_users(users, headers=headers)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 from uuid import UUID
 
 from api.v1.users.schemas import CreateUser, UpdateUser, User
@@ -28,15 +29,47 @@ class IUserRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_by_person_name_fields(
-        self, name: str, exact_match: bool = False, case_sensitive: bool = False
+    async def search(self, name: str, limit: int | None = None) -> list[User]:
+        """Users matching ``name`` by username or full name, best match first."""
+        pass
+
+    @abstractmethod
+    async def get_by_ids(self, ids: list[UUID]) -> list[User]:
+        """The ones of ``ids`` that exist, in no particular order."""
+        pass
+
+    @abstractmethod
+    async def get_all(
+        self, after: UUID | None = None, limit: int | None = None
+    ) -> list[User]:
+        pass
+
+    @abstractmethod
+    async def get_by_role_id(
+        self, role_id: UUID, after: UUID | None = None, limit: int | None = None
     ) -> list[User]:
+        """Users holding the role, ordered by id."""
+        pass
+
+    @abstractmethod
+    def stream_all(self) -> AsyncIterator[User]:
+        pass
+
+    @abstractmethod
+    async def create_many(self, infos: list[CreateUser]) -> list[User | None]:
+        """Insert all users in one statement.
+
+        Returns the created users in input order, None where a row hit a
+        unique constraint.
+        """
         pass
 
     @abstractmethod
-    async def get_all(self) -> list[User]:
+    async def get_taken_usernames(self, usernames: list[str]) -> set[str]:
+        """Lower-cased usernames from the given ones that are taken."""
         pass
 
     @abstractmethod
-    async def get_user_permissions(self, id) -> list[str]:
+    async def get_version(self) -> int:
+        """Counter bumped by every write to the table; used for ETags."""
         pass
@@ -2,8 +2,11 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from api.core.config import get_settings
 from config.validation import Validation
 
+settings = get_settings()
+
 validator = Validation()
 
 
@@ -11,25 +14,19 @@ class TundeModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class User(TundeModel):
+class ShowUser(TundeModel):
     id: UUID
     username: str
     first_name: str
     last_name: str
     patronymic: str | None = None
-    password: str | None = None
     finger_token: str | None = None
     role_ids: list[UUID] | None = []
 
 
-class ShowUser(TundeModel):
-    id: UUID
-    username: str
-    first_name: str
-    last_name: str
-    patronymic: str | None = None
-    finger_token: str | None = None
-    role_ids: list[UUID] | None = []
+# a ShowUser subclass, so responses serialize it without the password
+class User(ShowUser):
+    password: str | None = None
 
 
 class CreateUser(BaseModel):
@@ -67,6 +64,10 @@ class CreateUser(BaseModel):
         return value.strip()
 
 
+class BulkCreateUsers(BaseModel):
+    items: list[CreateUser] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
 class UpdateUser(BaseModel):
     username: str | None = None
     first_name: str | None = None
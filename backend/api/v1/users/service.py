@@ -1,12 +1,17 @@
+import asyncio
+from typing import AsyncIterator
 from uuid import UUID
 
 from api.core.config import get_settings
 from api.core.exceptions import AppExceptions
+from api.core.schemas import BulkCreateResult
+from api.v1.roles.registry import role_registry
 from api.v1.roles.repo_interface import IRoleRepository
 from api.v1.roles.schemas import Role
 from api.v1.users.repo_interface import IUserRepository
 from api.v1.users.schemas import CreateUser, User
-from db.db_exceptions import DBException
+from db.db_exceptions import DBException, UniqueViolation
+from db.routing import primary_only
 from utils.hashing import Hasher
 
 settings = get_settings()
@@ -21,31 +26,29 @@ class UserService:
         self._repo: IUserRepository = user_repository_interface
         self._role_repo: IRoleRepository = role_repository_interface
 
-    async def get_user_by_id(self, user_id: UUID) -> User:
+    async def get_user_by_id(self, user_id: UUID, for_update: bool = False) -> User:
+        """``for_update`` reads from the primary: the user is about to be written."""
         try:
-            user: User | None = await self._repo.get_by_id(user_id)
+            with primary_only(for_update):
+                user: User | None = await self._repo.get_by_id(user_id)
             if user is None:
                 raise AppExceptions.not_found_exception("User with this id not found")
             return user
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
-    async def create_user_in_database(self, user_info: CreateUser) -> User:
+    async def get_users_by_ids(self, user_ids: list[UUID]) -> list[User]:
         try:
-            if (
-                await self._repo.get_by_username(
-                    user_info.username, exact_match=True, case_sensitive=False
-                )
-                != []
-            ):
-                raise AppExceptions.bad_request_exception(
-                    f"User with username {user_info.username} already exists"
-                )
+            return await self._repo.get_by_ids(user_ids)
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
 
+    async def create_user_in_database(self, user_info: CreateUser) -> User:
+        try:
             if user_info.role_ids:
-                roles: dict[UUID, Role] = {
-                    role.id: role for role in await self._role_repo.get_all()
-                }
+                roles: dict[UUID, Role] = await role_registry.resolve(
+                    self._role_repo, user_info.role_ids
+                )
                 for role_id in user_info.role_ids:
                     if not (role := roles.get(role_id, None)):
                         raise AppExceptions.bad_request_exception(
@@ -55,49 +58,106 @@ class UserService:
                         raise AppExceptions.forbidden_exception(
                             "Creating a superuser is forbidden"
                         )
-            user_info.password = Hasher.get_password_hash(user_info.password)
+            user_info.password = await Hasher.get_password_hash_async(
+                user_info.password
+            )
             return await self._repo.create(user_info)
+        except UniqueViolation:
+            raise AppExceptions.bad_request_exception(
+                f"User with username {user_info.username} already exists"
+            )
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
+
+    async def create_users_in_bulk(self, items: list[CreateUser]) -> BulkCreateResult:
+        try:
+            taken_usernames = await self._repo.get_taken_usernames(
+                [item.username for item in items]
+            )
+            roles: dict[UUID, Role] = await role_registry.resolve(
+                self._role_repo,
+                {role_id for item in items for role_id in item.role_ids or []},
+            )
+            errors: dict[int, str] = {}
+            # only items that will be created claim their username
+            batch_usernames: set[str] = set()
+            for index, item in enumerate(items):
+                username = item.username.lower()
+                if username in taken_usernames:
+                    errors[index] = f"User with username {item.username} already exists"
+                    continue
+                if username in batch_usernames:
+                    errors[index] = (
+                        f"User with username {item.username} is repeated in batch"
+                    )
+                    continue
+                for role_id in item.role_ids or []:
+                    if not (role := roles.get(role_id, None)):
+                        errors[index] = f"Role with id {role_id} not found"
+                        break
+                    if role.name == settings.SUPER_ROLE_NAME:
+                        errors[index] = "Creating a superuser is forbidden"
+                        break
+                else:
+                    batch_usernames.add(username)
+
+            to_create = [index for index in range(len(items)) if index not in errors]
+            to_hash = [index for index in to_create if items[index].password]
+            for start in range(0, len(to_hash), settings.HASHING_MAX_WORKERS):
+                chunk = to_hash[start : start + settings.HASHING_MAX_WORKERS]
+                hashes = await asyncio.gather(
+                    *(
+                        Hasher.get_password_hash_async(items[index].password)
+                        for index in chunk
+                    )
+                )
+                for index, password_hash in zip(chunk, hashes):
+                    items[index].password = password_hash
+
+            created: dict[int, UUID] = {}
+            if to_create:
+                users = await self._repo.create_many([items[i] for i in to_create])
+                for index, user in zip(to_create, users):
+                    if user is None:
+                        errors[index] = (
+                            f"User with username {items[index].username} already exists"
+                        )
+                    else:
+                        created[index] = user.id
+            return BulkCreateResult.from_rows(len(items), created, errors)
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
     async def update_user(self, user: User, body: CreateUser) -> User:
         try:
             body.password = (
-                Hasher.get_password_hash(body.password) if body.password else None
+                await Hasher.get_password_hash_async(body.password)
+                if body.password
+                else None
             )
-            if not (user_info := body.model_dump(exclude_none=True)):
+            if not body.model_dump(exclude_none=True):
                 raise AppExceptions.validation_exception(
                     "At least one parameter must be defined"
                 )
-            if (
-                user_info.get("username", None)
-                and user_info["username"] != user.username
-                and await self._repo.get_by_username(
-                    user_info["username"], exact_match=True, case_sensitive=False
-                )
-                != []
-            ):
-                raise AppExceptions.bad_request_exception(
-                    f"User with username {user_info['username']} already exists"
-                )
-            roles: list[Role] = await self._role_repo.get_all()
-            user_role_names = [role.name for role in roles if role.id in user.role_ids]
-            if settings.SUPER_ROLE_NAME in user_role_names:
+            if await role_registry.has_super_role(self._role_repo, user.role_ids):
                 raise AppExceptions.forbidden_exception(
                     "User with super role is not allowed to perform this action"
                 )
             return await self._repo.update(user, body)
+        except UniqueViolation:
+            raise AppExceptions.bad_request_exception(
+                f"User with username {body.username} already exists"
+            )
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
     async def delete_user_by_id(self, user_id: UUID) -> UUID:
         try:
-            user: User | None = await self._repo.get_by_id(user_id)
+            with primary_only():
+                user: User | None = await self._repo.get_by_id(user_id)
             if user is None:
                 raise AppExceptions.not_found_exception("User with this id not found")
-            roles: list[Role] = await self._role_repo.get_all()
-            user_role_names = [role.name for role in roles if role.id in user.role_ids]
-            if settings.SUPER_ROLE_NAME in user_role_names:
+            if await role_registry.has_super_role(self._role_repo, user.role_ids):
                 raise AppExceptions.forbidden_exception(
                     "User with super role is not allowed to perform this action"
                 )
@@ -105,12 +165,38 @@ class UserService:
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
 
-    async def get_user_by_name_or_all(self, user_name: str) -> list[User]:
+    async def get_user_by_name_or_all(
+        self,
+        user_name: str | None,
+        after: UUID | None = None,
+        limit: int | None = None,
+    ) -> list[User]:
         try:
             if user_name:
-                users = await self._repo.get_by_username(user_name)
-                users += await self._repo.get_by_person_name_fields(user_name)
-                return {user.id: user for user in users}.values()
-            return await self._repo.get_all()
+                return await self._repo.search(user_name, limit=limit)
+            return await self._repo.get_all(after=after, limit=limit)
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
+
+    async def get_users_by_role(
+        self,
+        role_id: UUID,
+        after: UUID | None = None,
+        limit: int | None = None,
+    ) -> list[User]:
+        try:
+            if not await role_registry.resolve(self._role_repo, [role_id]):
+                raise AppExceptions.not_found_exception("Role with this id not found")
+            return await self._repo.get_by_role_id(role_id, after=after, limit=limit)
         except DBException:
             raise AppExceptions.service_unavailable_exception("Database error.")
+
+    async def get_version(self) -> int:
+        try:
+            return await self._repo.get_version()
+        except DBException:
+            raise AppExceptions.service_unavailable_exception("Database error.")
+
+    async def export_users(self) -> AsyncIterator[User]:
+        async for item in self._repo.stream_all():
+            yield item
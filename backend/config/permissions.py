@@ -1,6 +1,9 @@
 from enum import StrEnum
+from typing import Iterable
 
 
+# Each permission owns the bit at its position in the enum, and that bit is
+# baked into issued tokens: only ever append new members, never reorder.
 class Permissions(StrEnum):
     CREATE_ROLE = "create_role"
     DELETE_ROLE = "delete_role"
@@ -18,3 +21,15 @@ class Permissions(StrEnum):
     UPDATE_USER = "update_user"
 
     GET_LOGS = "get_logs"
+
+
+PERMISSION_BITS: dict[str, int] = {
+    permission.value: 1 << index for index, permission in enumerate(Permissions)
+}
+
+
+def permissions_to_mask(permissions: Iterable[str]) -> int:
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS.get(permission, 0)
+    return mask
@@ -5,3 +5,12 @@ class DBException(SQLAlchemyError):
     """Base class for handling any SQLAlchemy-related errors."""
 
     pass
+
+
+class UniqueViolation(DBException):
+    """Insert or update rejected by a unique constraint on ``field``."""
+
+    def __init__(self, field: str, constraint: str | None = None):
+        super().__init__(f"Unique constraint {constraint} violated on {field}")
+        self.field = field
+        self.constraint = constraint
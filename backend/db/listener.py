@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Callable
+
+import asyncpg
+
+from api.core.config import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+NotificationCallback = Callable[[str], None]
+
+
+class PgListener:
+    """Single LISTEN connection per worker that fans notifications out.
+
+    Callbacks run on the event loop and must not block. ``on_connect``
+    callbacks fire after every (re)connect, since notifications sent while the
+    connection was down are lost and anything derived from them is stale.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float):
+        self._dsn = dsn.replace("+asyncpg", "")
+        self._reconnect_delay = reconnect_delay
+        self._channels: dict[str, list[NotificationCallback]] = {}
+        self._on_connect: list[Callable[[], None]] = []
+        self._task: asyncio.Task | None = None
+        self.connected = False
+
+    def subscribe(self, channel: str, callback: NotificationCallback) -> None:
+        self._channels.setdefault(channel, []).append(callback)
+
+    def on_connect(self, callback: Callable[[], None]) -> None:
+        self._on_connect.append(callback)
+
+    def _dispatch(self, connection, pid, channel: str, payload: str) -> None:
+        for callback in self._channels.get(channel, []):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("Notification callback for %s failed", channel)
+
+    async def _listen_once(self) -> None:
+        connection = await asyncpg.connect(self._dsn)
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+        try:
+            for channel in self._channels:
+                await connection.add_listener(channel, self._dispatch)
+            self.connected = True
+            for callback in self._on_connect:
+                callback()
+            await lost.wait()
+        finally:
+            self.connected = False
+            if not connection.is_closed():
+                await connection.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("LISTEN connection failed: %s", exc)
+            await asyncio.sleep(self._reconnect_delay)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+pg_listener = PgListener(
+    settings.LISTEN_DATABASE_URL or settings.ASYNC_REAL_DATABASE_URL,
+    reconnect_delay=settings.LISTEN_RECONNECT_DELAY_S,
+)
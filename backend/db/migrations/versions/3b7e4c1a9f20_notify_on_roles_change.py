@@ -0,0 +1,40 @@
+"""Notify listeners when the roles table changes
+
+Revision ID: 3b7e4c1a9f20
+Revises: 9dc0b3312bf6
+Create Date: 2025-12-01 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e4c1a9f20"
+down_revision: Union[str, Sequence[str], None] = "9dc0b3312bf6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_roles_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('roles_changed', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    op.execute("""
+        CREATE TRIGGER roles_changed_notify
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON roles
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_roles_changed();
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS roles_changed_notify ON roles")
+    op.execute("DROP FUNCTION IF EXISTS notify_roles_changed()")
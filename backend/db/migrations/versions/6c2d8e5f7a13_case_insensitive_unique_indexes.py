@@ -0,0 +1,47 @@
+"""Case-insensitive unique indexes on names
+
+Revision ID: 6c2d8e5f7a13
+Revises: 3b7e4c1a9f20
+Create Date: 2025-12-03 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6c2d8e5f7a13"
+down_revision: Union[str, Sequence[str], None] = "3b7e4c1a9f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UNIQUE_LOWER_INDEXES = {
+    "ux_devices_name_lower": ("devices", "name"),
+    "ux_devices_android_id_lower": ("devices", "android_id"),
+    "ux_users_username_lower": ("users", "username"),
+    "ux_roles_name_lower": ("roles", "name"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # built concurrently so writes to the tables are not blocked meanwhile
+    with op.get_context().autocommit_block():
+        for index_name, (table, column) in UNIQUE_LOWER_INDEXES.items():
+            op.create_index(
+                index_name,
+                table,
+                [sa.text(f"lower({column})")],
+                unique=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, (table, _) in reversed(UNIQUE_LOWER_INDEXES.items()):
+            op.drop_index(index_name, table_name=table, postgresql_concurrently=True)
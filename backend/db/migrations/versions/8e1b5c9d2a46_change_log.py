@@ -0,0 +1,70 @@
+"""Change log for delta sync
+
+Revision ID: 8e1b5c9d2a46
+Revises: 4f8a2d6b1c37
+Create Date: 2025-12-08 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8e1b5c9d2a46"
+down_revision: Union[str, Sequence[str], None] = "4f8a2d6b1c37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOGGED_TABLES = ("users", "devices", "roles")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "change_log",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("xid", sa.BigInteger(), nullable=False),
+        sa.Column("table_name", sa.String(length=63), nullable=False),
+        sa.Column("row_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("op", sa.String(length=1), nullable=False),
+        sa.Column(
+            "changed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_change_log_xid_id", "change_log", ["xid", "id"])
+    op.execute("""
+        CREATE OR REPLACE FUNCTION log_row_change() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO change_log (xid, table_name, row_id, op)
+            VALUES (
+                pg_current_xact_id()::text::bigint,
+                TG_TABLE_NAME,
+                CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END,
+                left(TG_OP, 1)
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    for table in LOGGED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_log_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION log_row_change();
+            """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in LOGGED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_log_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS log_row_change()")
+    op.drop_index("ix_change_log_xid_id", table_name="change_log")
+    op.drop_table("change_log")
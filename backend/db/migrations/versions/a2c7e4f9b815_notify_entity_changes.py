@@ -0,0 +1,54 @@
+"""Notify listeners of role, device and user permission changes
+
+Revision ID: a2c7e4f9b815
+Revises: 8e1b5c9d2a46
+Create Date: 2025-12-10 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a2c7e4f9b815"
+down_revision: Union[str, Sequence[str], None] = "8e1b5c9d2a46"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_entity_change() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('entity_changes', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', lower(TG_OP),
+                'id', CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    for table in ("roles", "devices"):
+        op.execute(f"""
+            CREATE TRIGGER {table}_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_entity_change();
+            """)
+    # for users only a change of roles, i.e. of permissions, is pushed
+    op.execute("""
+        CREATE TRIGGER users_notify_roles_change
+        AFTER UPDATE OF role_ids ON users
+        FOR EACH ROW WHEN (OLD.role_ids IS DISTINCT FROM NEW.role_ids)
+        EXECUTE FUNCTION notify_entity_change();
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_notify_roles_change ON users")
+    for table in ("roles", "devices"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_entity_change()")
@@ -0,0 +1,47 @@
+"""Trigram indexes for substring search on names
+
+Revision ID: c5d3f8a1e627
+Revises: a2c7e4f9b815
+Create Date: 2025-12-12 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d3f8a1e627"
+down_revision: Union[str, Sequence[str], None] = "a2c7e4f9b815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = {
+    "ix_users_username_trgm": ("users", "username"),
+    "ix_devices_name_trgm": ("devices", "name"),
+    "ix_roles_name_trgm": ("roles", "name"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # needs the contrib package on the server (postgresql-contrib)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # built concurrently so writes to the tables are not blocked meanwhile
+    with op.get_context().autocommit_block():
+        for index_name, (table, column) in TRIGRAM_INDEXES.items():
+            op.create_index(
+                index_name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name in TRIGRAM_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
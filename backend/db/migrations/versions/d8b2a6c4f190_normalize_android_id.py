@@ -0,0 +1,103 @@
+"""Store android_id normalized (trimmed, lower case)
+
+Revision ID: d8b2a6c4f190
+Revises: c5d3f8a1e627
+Create Date: 2025-12-15 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d8b2a6c4f190"
+down_revision: Union[str, Sequence[str], None] = "c5d3f8a1e627"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    # " abc" and "ABC" could both be stored so far; normalizing them would
+    # collide on devices_android_id_key halfway through the backfill
+    duplicates = connection.execute(sa.text("""
+        SELECT lower(btrim(android_id)), array_agg(android_id ORDER BY android_id)
+        FROM devices
+        GROUP BY 1
+        HAVING count(*) > 1
+        LIMIT 20
+        """)).all()
+    if duplicates:
+        listed = "; ".join(
+            f"{normalized!r}: {', '.join(map(repr, originals))}"
+            for normalized, originals in duplicates
+        )
+        raise RuntimeError(
+            "Devices whose android_id is the same once trimmed and lower-cased "
+            f"must be merged or renamed before this migration: {listed}"
+        )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION normalize_android_id() RETURNS trigger AS $$
+        BEGIN
+            NEW.android_id := lower(btrim(NEW.android_id));
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    op.execute("""
+        CREATE TRIGGER devices_normalize_android_id
+        BEFORE INSERT OR UPDATE OF android_id ON devices
+        FOR EACH ROW EXECUTE FUNCTION normalize_android_id();
+        """)
+
+    # walk the table by id and commit every batch, so existing rows are fixed
+    # without holding locks for the whole run
+    select_batch_end = sa.text("""
+        SELECT id FROM (
+            SELECT id FROM devices
+            WHERE id > CAST(:after AS uuid)
+            ORDER BY id
+            LIMIT :batch_size
+        ) AS batch
+        ORDER BY id DESC
+        LIMIT 1
+        """)
+    backfill = sa.text("""
+        UPDATE devices SET android_id = lower(btrim(android_id))
+        WHERE id > CAST(:after AS uuid) AND id <= CAST(:batch_end AS uuid)
+          AND android_id <> lower(btrim(android_id))
+        """)
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        after = "00000000-0000-0000-0000-000000000000"
+        while True:
+            batch_end = connection.execute(
+                select_batch_end,
+                {"after": after, "batch_size": BACKFILL_BATCH_SIZE},
+            ).scalar()
+            if batch_end is None:
+                break
+            batch_end = str(batch_end)
+            connection.execute(backfill, {"after": after, "batch_end": batch_end})
+            after = batch_end
+
+    # android_id is lower case now, so the plain unique constraint covers it
+    op.drop_index("ux_devices_android_id_lower", table_name="devices")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ux_devices_android_id_lower",
+        "devices",
+        [sa.text("lower(android_id)")],
+        unique=True,
+    )
+    op.execute("DROP TRIGGER IF EXISTS devices_normalize_android_id ON devices")
+    op.execute("DROP FUNCTION IF EXISTS normalize_android_id()")
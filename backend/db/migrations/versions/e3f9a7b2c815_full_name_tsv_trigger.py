@@ -0,0 +1,81 @@
+"""Keep users.full_name_tsv in sync with the name fields
+
+Revision ID: e3f9a7b2c815
+Revises: d8b2a6c4f190
+Create Date: 2025-12-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3f9a7b2c815"
+down_revision: Union[str, Sequence[str], None] = "d8b2a6c4f190"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+FULL_NAME_TSV = (
+    "to_tsvector('russian', concat_ws(' ', {0}first_name, {0}last_name, {0}patronymic))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A trigger rather than a GENERATED column: adding a stored generated
+    # column rewrites the whole table under an exclusive lock.
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION users_full_name_tsv() RETURNS trigger AS $$
+        BEGIN
+            NEW.full_name_tsv := {FULL_NAME_TSV.format("NEW.")};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    op.execute("""
+        CREATE TRIGGER users_full_name_tsv
+        BEFORE INSERT OR UPDATE OF first_name, last_name, patronymic, full_name_tsv
+        ON users
+        FOR EACH ROW EXECUTE FUNCTION users_full_name_tsv();
+        """)
+
+    # walk the table by id and commit every batch, so rows written before
+    # the trigger existed are fixed without holding locks for the whole run
+    select_batch_end = sa.text("""
+        SELECT id FROM (
+            SELECT id FROM users
+            WHERE id > CAST(:after AS uuid)
+            ORDER BY id
+            LIMIT :batch_size
+        ) AS batch
+        ORDER BY id DESC
+        LIMIT 1
+        """)
+    backfill = sa.text(f"""
+        UPDATE users SET full_name_tsv = {FULL_NAME_TSV.format("")}
+        WHERE id > CAST(:after AS uuid) AND id <= CAST(:batch_end AS uuid)
+          AND full_name_tsv IS DISTINCT FROM {FULL_NAME_TSV.format("")}
+        """)
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        after = "00000000-0000-0000-0000-000000000000"
+        while True:
+            batch_end = connection.execute(
+                select_batch_end,
+                {"after": after, "batch_size": BACKFILL_BATCH_SIZE},
+            ).scalar()
+            if batch_end is None:
+                break
+            batch_end = str(batch_end)
+            connection.execute(backfill, {"after": after, "batch_end": batch_end})
+            after = batch_end
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_full_name_tsv ON users")
+    op.execute("DROP FUNCTION IF EXISTS users_full_name_tsv()")
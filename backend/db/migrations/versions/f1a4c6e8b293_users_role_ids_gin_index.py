@@ -0,0 +1,38 @@
+"""GIN index on users.role_ids for role containment queries
+
+Revision ID: f1a4c6e8b293
+Revises: e3f9a7b2c815
+Create Date: 2025-12-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1a4c6e8b293"
+down_revision: Union[str, Sequence[str], None] = "e3f9a7b2c815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # built concurrently so writes to users are not blocked meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_role_ids",
+            "users",
+            ["role_ids"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_role_ids", table_name="users", postgresql_concurrently=True
+        )
@@ -1,8 +1,9 @@
 import uuid
+from datetime import datetime
 from typing import Annotated
 
-from sqlalchemy import ARRAY, Index, String
-from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy import BigInteger, DateTime, Identity, Index, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from uuid_extensions import uuid7
 
@@ -42,6 +43,8 @@ class User(Base):
 
     __table_args__ = (
         Index("idx_users_full_name_tsv", "full_name_tsv", postgresql_using="gin"),
+        # "which users hold role X" is a containment query (role_ids @> ...)
+        Index("ix_users_role_ids", "role_ids", postgresql_using="gin"),
     )
 
 
@@ -52,6 +55,62 @@ class Device(Base):
     name: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
     android_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
 
+    # stored trimmed and lower-cased by a trigger (see normalize_android_id),
+    # so lookups are plain equality probes
     __table_args__ = (
         Index("ix_devices_android_id_hash", "android_id", postgresql_using="hash"),
     )
+
+
+class TableVersion(Base):
+    """Bumped by a statement trigger on every write to ``table_name``."""
+
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class ChangeLog(Base):
+    """One row per insert, update or delete on users, devices and roles,
+    written by a row trigger. ``xid`` is the writing transaction's id."""
+
+    __tablename__ = "change_log"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    xid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    table_name: Mapped[str] = mapped_column(String(63), nullable=False)
+    row_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    op: Mapped[str] = mapped_column(String(1), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (Index("ix_change_log_xid_id", "xid", "id"),)
+
+
+# Uniqueness is case-insensitive; the repositories rely on these index names to
+# tell which field a rejected insert or update collided on.
+Index("ux_roles_name_lower", func.lower(Role.name), unique=True)
+Index("ux_users_username_lower", func.lower(User.username), unique=True)
+Index("ux_devices_name_lower", func.lower(Device.name), unique=True)
+
+# Substring search (ILIKE '%...%') on names; needs the pg_trgm extension.
+Index(
+    "ix_users_username_trgm",
+    User.username,
+    postgresql_using="gin",
+    postgresql_ops={"username": "gin_trgm_ops"},
+)
+Index(
+    "ix_devices_name_trgm",
+    Device.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+)
+Index(
+    "ix_roles_name_trgm",
+    Role.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+)
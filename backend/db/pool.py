@@ -0,0 +1,53 @@
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+_in_checkout: ContextVar[bool] = ContextVar("in_checkout", default=False)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts wait.
+
+    The wait covers getting a connection out of the pool, including opening a
+    new one when the pool grows into its overflow.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; time only the outer call
+        if _in_checkout.get():
+            return super()._do_get()
+        token = _in_checkout.set(True)
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            _in_checkout.reset(token)
+            waited = time.perf_counter() - start_time
+            self.checkouts += 1
+            self.total_wait_s += waited
+            self.max_wait_s = max(self.max_wait_s, waited)
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "total_wait_s": round(self.total_wait_s, 6),
+            "max_wait_s": round(self.max_wait_s, 6),
+        }
@@ -1,17 +1,51 @@
+from typing import AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import delete, func, select, update
+from pydantic import TypeAdapter
+from sqlalchemy import any_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from uuid_extensions import uuid7
 
+from api.core.config import get_settings
 from api.v1.devices.repo_interface import IDeviceRepository
-from api.v1.devices.schemas import CreateDevice, Device, UpdateDevice
+from api.v1.devices.schemas import (
+    CreateDevice,
+    Device,
+    UpdateDevice,
+    normalize_android_id,
+)
 from db.models import Device as DeviceModel
+from db.repositories.postgres.utils import (
+    escape_like,
+    stream_validated,
+    table_version,
+    unique_violations,
+    uuid_array,
+    validate_rows,
+)
+from db.routing import read_only
+
+settings = get_settings()
+
+UNIQUE_FIELDS = {
+    "devices_name_key": "name",
+    "ux_devices_name_lower": "name",
+    "devices_android_id_key": "android_id",
+}
+
+device_list_adapter = TypeAdapter(list[Device])
 
 
 class PostgresDeviceRepo(IDeviceRepository):
     def __init__(self, session: AsyncSession):
         self._session = session
 
+    @read_only
+    async def get_version(self) -> int:
+        return await table_version(self._session, DeviceModel.__tablename__)
+
+    @read_only
     async def get_by_id(self, id: UUID) -> Device | None:
         stmt = select(DeviceModel).where(DeviceModel.id == id)
         result = await self._session.execute(stmt)
@@ -21,7 +55,8 @@ class PostgresDeviceRepo(IDeviceRepository):
     async def create(self, info: CreateDevice) -> Device:
         device = DeviceModel(**info.model_dump(exclude_none=True))
         self._session.add(device)
-        await self._session.commit()
+        async with unique_violations(self._session, UNIQUE_FIELDS):
+            await self._session.commit()
         await self._session.refresh(device)
         return Device.model_validate(device)
 
@@ -32,8 +67,9 @@ class PostgresDeviceRepo(IDeviceRepository):
             .values(**info.model_dump(exclude_none=True))
             .returning(DeviceModel)
         )
-        result = await self._session.execute(stmt)
-        await self._session.commit()
+        async with unique_violations(self._session, UNIQUE_FIELDS):
+            result = await self._session.execute(stmt)
+            await self._session.commit()
         updated_device = result.scalar_one()
         return Device.model_validate(updated_device)
 
@@ -44,11 +80,13 @@ class PostgresDeviceRepo(IDeviceRepository):
         deleted_id = result.scalar_one_or_none()
         return deleted_id
 
+    @read_only
     async def get_by_name(
         self,
         name: str,
         exact_match: bool = False,
         case_sensitive: bool = False,
+        limit: int | None = None,
     ) -> list[Device]:
         if exact_match:
             pattern = name
@@ -58,27 +96,81 @@ class PostgresDeviceRepo(IDeviceRepository):
                 else func.lower(DeviceModel.name) == pattern.lower()
             )
         else:
-            pattern = f"%{name}%"
+            pattern = f"%{escape_like(name)}%"
             filter_expr = (
                 DeviceModel.name.like(pattern)
                 if case_sensitive
                 else DeviceModel.name.ilike(pattern)
             )
 
-        stmt = select(DeviceModel).where(filter_expr)
+        stmt = select(*DeviceModel.__table__.c).where(filter_expr)
+        if limit is not None:
+            stmt = stmt.order_by(DeviceModel.name, DeviceModel.id).limit(limit)
+        result = await self._session.execute(stmt)
+        return validate_rows(result, device_list_adapter)
+
+    @read_only
+    async def get_by_ids(self, ids: list[UUID]) -> list[Device]:
+        stmt = select(*DeviceModel.__table__.c).where(
+            DeviceModel.id == any_(uuid_array(ids))
+        )
         result = await self._session.execute(stmt)
-        return [Device.model_validate(d) for d in result.scalars().all()]
+        return validate_rows(result, device_list_adapter)
 
-    async def get_all(self) -> list[Device]:
-        stmt = select(DeviceModel)
+    @read_only
+    async def get_all(
+        self, after: UUID | None = None, limit: int | None = None
+    ) -> list[Device]:
+        stmt = select(*DeviceModel.__table__.c).order_by(DeviceModel.id)
+        if after is not None:
+            stmt = stmt.where(DeviceModel.id > after)
+        if limit is not None:
+            stmt = stmt.limit(limit)
         result = await self._session.execute(stmt)
-        devices = result.scalars().all()
-        return [Device.model_validate(d) for d in devices]
+        return validate_rows(result, device_list_adapter)
+
+    @read_only
+    async def stream_all(self) -> AsyncIterator[Device]:
+        stmt = select(*DeviceModel.__table__.c).order_by(DeviceModel.id)
+        async for device in stream_validated(
+            self._session, stmt, device_list_adapter, settings.EXPORT_BATCH_SIZE
+        ):
+            yield device
 
     async def get_by_android_id(self, android_id: str) -> Device | None:
         stmt = select(DeviceModel).where(
-            func.lower(DeviceModel.android_id) == android_id.lower()
+            DeviceModel.android_id == normalize_android_id(android_id)
         )
         result = await self._session.execute(stmt)
         device = result.scalar_one_or_none()
         return Device.model_validate(device) if device else None
+
+    async def create_many(self, infos: list[CreateDevice]) -> list[Device | None]:
+        rows = [{"id": uuid7(), **info.model_dump()} for info in infos]
+        stmt = (
+            insert(DeviceModel.__table__)
+            .on_conflict_do_nothing()
+            .returning(*DeviceModel.__table__.columns)
+        )
+        result = await self._session.execute(stmt, rows)
+        created = {device.id: Device.model_validate(device) for device in result.all()}
+        await self._session.commit()
+        return [created.get(row["id"]) for row in rows]
+
+    async def get_taken_names_and_android_ids(
+        self, names: list[str], android_ids: list[str]
+    ) -> tuple[set[str], set[str]]:
+        lower_names = [name.lower() for name in names]
+        normalized_android_ids = [normalize_android_id(a) for a in android_ids]
+        stmt = select(func.lower(DeviceModel.name), DeviceModel.android_id).where(
+            or_(
+                func.lower(DeviceModel.name).in_(lower_names),
+                DeviceModel.android_id.in_(normalized_android_ids),
+            )
+        )
+        result = await self._session.execute(stmt)
+        taken_names, taken_android_ids = set(), set()
+        for name, android_id in result.all():
+            taken_names.add(name)
+            taken_android_ids.add(android_id)
+        return taken_names, taken_android_ids
@@ -1,17 +1,40 @@
+from typing import AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import delete, func, select, update
+from pydantic import TypeAdapter
+from sqlalchemy import any_, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.core.config import get_settings
 from api.v1.roles.repo_interface import IRoleRepository
 from api.v1.roles.schemas import CreateRole, Role, UpdateRole
 from db.models import Role as RoleDb
+from db.repositories.postgres.utils import (
+    escape_like,
+    stream_validated,
+    table_version,
+    unique_violations,
+    uuid_array,
+    validate_rows,
+)
+from db.routing import read_only
+
+settings = get_settings()
+
+UNIQUE_FIELDS = {"roles_name_key": "name", "ux_roles_name_lower": "name"}
+
+role_list_adapter = TypeAdapter(list[Role])
 
 
 class PostgresRoleRepo(IRoleRepository):
     def __init__(self, session: AsyncSession):
         self._session = session
 
+    @read_only
+    async def get_version(self) -> int:
+        return await table_version(self._session, RoleDb.__tablename__)
+
+    @read_only
     async def get_by_id(self, id: UUID) -> Role | None:
         stmt = select(RoleDb).where(RoleDb.id == id)
         result = await self._session.execute(stmt)
@@ -21,7 +44,8 @@ class PostgresRoleRepo(IRoleRepository):
     async def create(self, info: CreateRole) -> Role:
         role = RoleDb(**info.model_dump(exclude_none=True))
         self._session.add(role)
-        await self._session.commit()
+        async with unique_violations(self._session, UNIQUE_FIELDS):
+            await self._session.commit()
         await self._session.refresh(role)
         return Role.model_validate(role)
 
@@ -32,8 +56,9 @@ class PostgresRoleRepo(IRoleRepository):
             .values(**info.model_dump(exclude_none=True))
             .returning(RoleDb)
         )
-        result = await self._session.execute(stmt)
-        await self._session.commit()
+        async with unique_violations(self._session, UNIQUE_FIELDS):
+            result = await self._session.execute(stmt)
+            await self._session.commit()
         updated_role = result.scalar_one()
         return Role.model_validate(updated_role)
 
@@ -44,8 +69,13 @@ class PostgresRoleRepo(IRoleRepository):
         deleted_id = result.scalar_one_or_none()
         return deleted_id
 
+    @read_only
     async def get_by_name(
-        self, name: str, exact_match: bool = False, case_sensitive: bool = False
+        self,
+        name: str,
+        exact_match: bool = False,
+        case_sensitive: bool = False,
+        limit: int | None = None,
     ) -> list[Role]:
         if exact_match:
             pattern = name
@@ -55,20 +85,41 @@ class PostgresRoleRepo(IRoleRepository):
                 else func.lower(RoleDb.name) == pattern.lower()
             )
         else:
-            pattern = f"%{name}%"
+            pattern = f"%{escape_like(name)}%"
             filter_expr = (
                 RoleDb.name.like(pattern)
                 if case_sensitive
                 else RoleDb.name.ilike(pattern)
             )
 
-        stmt = select(RoleDb).where(filter_expr)
+        stmt = select(*RoleDb.__table__.c).where(filter_expr)
+        if limit is not None:
+            stmt = stmt.order_by(RoleDb.name, RoleDb.id).limit(limit)
         result = await self._session.execute(stmt)
-        roles = result.scalars().all()
-        return [Role.model_validate(r) for r in roles]
+        return validate_rows(result, role_list_adapter)
 
-    async def get_all(self) -> list[Role]:
-        stmt = select(RoleDb)
+    @read_only
+    async def get_by_ids(self, ids: list[UUID]) -> list[Role]:
+        stmt = select(*RoleDb.__table__.c).where(RoleDb.id == any_(uuid_array(ids)))
         result = await self._session.execute(stmt)
-        roles = result.scalars().all()
-        return [Role.model_validate(r) for r in roles]
+        return validate_rows(result, role_list_adapter)
+
+    @read_only
+    async def get_all(
+        self, after: UUID | None = None, limit: int | None = None
+    ) -> list[Role]:
+        stmt = select(*RoleDb.__table__.c).order_by(RoleDb.id)
+        if after is not None:
+            stmt = stmt.where(RoleDb.id > after)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self._session.execute(stmt)
+        return validate_rows(result, role_list_adapter)
+
+    @read_only
+    async def stream_all(self) -> AsyncIterator[Role]:
+        stmt = select(*RoleDb.__table__.c).order_by(RoleDb.id)
+        async for role in stream_validated(
+            self._session, stmt, role_list_adapter, settings.EXPORT_BATCH_SIZE
+        ):
+            yield role
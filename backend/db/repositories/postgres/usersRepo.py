@@ -1,19 +1,53 @@
+from typing import AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import delete, func, select, update
+from pydantic import TypeAdapter
+from sqlalchemy import any_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from uuid_extensions import uuid7
 
+from api.core.config import get_settings
 from api.v1.users.repo_interface import IUserRepository
 from api.v1.users.schemas import CreateUser, UpdateUser, User
-from db.models import Role
 from db.models import User as UserDb
-from db.repositories.postgres.utils import escape_tsquery
+from db.repositories.postgres.utils import (
+    escape_like,
+    escape_tsquery,
+    stream_validated,
+    table_version,
+    unique_violations,
+    uuid_array,
+    validate_rows,
+)
+from db.routing import read_only
+
+settings = get_settings()
+
+UNIQUE_FIELDS = {
+    "users_username_key": "username",
+    "ux_users_username_lower": "username",
+}
+
+# list endpoints only show ShowUser fields, so the password hash and the
+# search vector are not loaded for them
+USER_LIST_COLUMNS = [
+    column
+    for column in UserDb.__table__.c
+    if column.name not in ("password", "full_name_tsv")
+]
+user_list_adapter = TypeAdapter(list[User])
 
 
 class PostgresUserRepo(IUserRepository):
     def __init__(self, session: AsyncSession):
         self._session: AsyncSession = session
 
+    @read_only
+    async def get_version(self) -> int:
+        return await table_version(self._session, UserDb.__tablename__)
+
+    @read_only
     async def get_by_id(self, id: UUID) -> User | None:
         stmt = select(UserDb).where(UserDb.id == id)
         result = await self._session.execute(stmt)
@@ -22,10 +56,9 @@ class PostgresUserRepo(IUserRepository):
 
     async def create(self, info: CreateUser) -> User:
         user = UserDb(**info.model_dump(exclude_none=True))
-        full_name = f"{user.first_name} {user.last_name} {user.patronymic or ''}"
-        user.full_name_tsv = func.to_tsvector("russian", full_name)
         self._session.add(user)
-        await self._session.commit()
+        async with unique_violations(self._session, UNIQUE_FIELDS):
+            await self._session.commit()
         await self._session.refresh(user)
         return User.model_validate(user)
 
@@ -36,8 +69,9 @@ class PostgresUserRepo(IUserRepository):
             .values(**info.model_dump(exclude_none=True))
             .returning(UserDb)
         )
-        result = await self._session.execute(stmt)
-        await self._session.commit()
+        async with unique_violations(self._session, UNIQUE_FIELDS):
+            result = await self._session.execute(stmt)
+            await self._session.commit()
         updated_user = result.scalar_one()
         return User.model_validate(updated_user)
 
@@ -59,7 +93,7 @@ class PostgresUserRepo(IUserRepository):
                 else func.lower(UserDb.username) == pattern.lower()
             )
         else:
-            pattern = f"%{name}%"
+            pattern = f"%{escape_like(name)}%"
             filter_expr = (
                 UserDb.username.like(pattern)
                 if case_sensitive
@@ -70,35 +104,93 @@ class PostgresUserRepo(IUserRepository):
         users = result.scalars().all()
         return [User.model_validate(u) for u in users]
 
-    async def get_by_person_name_fields(self, name: str) -> list[User]:
+    @read_only
+    async def search(self, name: str, limit: int | None = None) -> list[User]:
         """
-        Full-text search for users by first name, last name, or patronymic.
-        Works with multiple words in any order, partial matches supported.
+        Users whose username contains ``name``, or whose first name, last name
+        and patronymic match all of its words (prefixes, in any order).
+
+        One query for both; ordered by trigram similarity of the username plus
+        the full-text rank, so exact usernames come first.
         """
+        escaped = escape_like(name)
+        matches = [UserDb.username.ilike(f"%{escaped}%")]
+        rank = func.similarity(UserDb.username, name)
 
         words = [escape_tsquery(w.strip()) for w in name.split() if w.strip()]
         query = " & ".join(f"{word}:*" for word in words if word)
+        if query:
+            tsquery = func.to_tsquery("russian", query)
+            matches.append(UserDb.full_name_tsv.op("@@")(tsquery))
+            rank = rank + func.coalesce(func.ts_rank(UserDb.full_name_tsv, tsquery), 0)
 
-        stmt = select(UserDb).where(
-            UserDb.full_name_tsv.op("@@")(func.to_tsquery("russian", query))
+        stmt = (
+            select(*USER_LIST_COLUMNS)
+            .where(or_(*matches))
+            .order_by(rank.desc(), UserDb.username)
         )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self._session.execute(stmt)
+        return validate_rows(result, user_list_adapter)
 
+    @read_only
+    async def get_by_ids(self, ids: list[UUID]) -> list[User]:
+        stmt = select(*USER_LIST_COLUMNS).where(UserDb.id == any_(uuid_array(ids)))
         result = await self._session.execute(stmt)
-        users = result.scalars().all()
-        return [User.model_validate(u) for u in users]
+        return validate_rows(result, user_list_adapter)
 
-    async def get_all(self) -> list[User]:
-        stmt = select(UserDb)
+    @read_only
+    async def get_all(
+        self, after: UUID | None = None, limit: int | None = None
+    ) -> list[User]:
+        stmt = select(*USER_LIST_COLUMNS).order_by(UserDb.id)
+        if after is not None:
+            stmt = stmt.where(UserDb.id > after)
+        if limit is not None:
+            stmt = stmt.limit(limit)
         result = await self._session.execute(stmt)
-        users = result.scalars().all()
-        return [User.model_validate(u) for u in users]
+        return validate_rows(result, user_list_adapter)
+
+    @read_only
+    async def get_by_role_id(
+        self, role_id: UUID, after: UUID | None = None, limit: int | None = None
+    ) -> list[User]:
+        stmt = (
+            select(*USER_LIST_COLUMNS)
+            .where(UserDb.role_ids.contains([role_id]))
+            .order_by(UserDb.id)
+        )
+        if after is not None:
+            stmt = stmt.where(UserDb.id > after)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self._session.execute(stmt)
+        return validate_rows(result, user_list_adapter)
+
+    @read_only
+    async def stream_all(self) -> AsyncIterator[User]:
+        stmt = select(*USER_LIST_COLUMNS).order_by(UserDb.id)
+        async for user in stream_validated(
+            self._session, stmt, user_list_adapter, settings.EXPORT_BATCH_SIZE
+        ):
+            yield user
 
-    async def get_user_permissions(self, user_id: UUID) -> list[str]:
+    async def create_many(self, infos: list[CreateUser]) -> list[User | None]:
+        rows = [{"id": uuid7(), **info.model_dump()} for info in infos]
         stmt = (
-            select(func.unnest(Role.permissions))
-            .select_from(UserDb)
-            .join(Role, Role.id == func.any(UserDb.role_ids))
-            .where(UserDb.id == user_id)
+            insert(UserDb.__table__)
+            .on_conflict_do_nothing()
+            .returning(*UserDb.__table__.columns)
+        )
+        result = await self._session.execute(stmt, rows)
+        created = {user.id: User.model_validate(user) for user in result.all()}
+        await self._session.commit()
+        return [created.get(row["id"]) for row in rows]
+
+    async def get_taken_usernames(self, usernames: list[str]) -> set[str]:
+        stmt = select(func.lower(UserDb.username)).where(
+            func.lower(UserDb.username).in_([name.lower() for name in usernames])
         )
         result = await self._session.execute(stmt)
-        return list(set(result.scalars().all()))
+        return set(result.scalars().all())
@@ -1,5 +1,79 @@
 import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy import BindParameter, Result, Select, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.db_exceptions import UniqueViolation
+from db.models import TableVersion
+
+UNIQUE_VIOLATION_SQLSTATE = "23505"
 
 
 def escape_tsquery(word: str) -> str:
     return re.sub(r"[^a-zA-Zа-яА-Я0-9_]", "", word)
+
+
+def escape_like(value: str) -> str:
+    """Make ``value`` match literally inside a LIKE pattern."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def uuid_array(ids: Iterable[UUID]) -> BindParameter:
+    """``ids`` as one array parameter, for ``column == any_(uuid_array(ids))``.
+
+    Unlike ``in_()``, which renders a placeholder per id, the statement text
+    does not depend on how many ids there are, so it is prepared once.
+    """
+    return bindparam("ids", list(ids), type_=ARRAY(PG_UUID(as_uuid=True)), unique=True)
+
+
+@asynccontextmanager
+async def unique_violations(session: AsyncSession, fields: dict[str, str]):
+    """Re-raise a unique-constraint IntegrityError as UniqueViolation.
+
+    ``fields`` maps constraint or unique index names to the field they guard.
+    """
+    try:
+        yield
+    except IntegrityError as exc:
+        await session.rollback()
+        constraint = getattr(exc.orig.__cause__, "constraint_name", None)
+        if (
+            getattr(exc.orig, "sqlstate", None) != UNIQUE_VIOLATION_SQLSTATE
+            or constraint not in fields
+        ):
+            raise
+        raise UniqueViolation(fields[constraint], constraint) from exc
+
+
+def validate_rows(result: Result, adapter: TypeAdapter) -> list[Any]:
+    """Build schemas straight from Core rows in one ``adapter`` call.
+
+    Skips ORM instances and the identity map; meant for list queries that
+    select plain columns.
+    """
+    keys = tuple(result.keys())
+    return adapter.validate_python([dict(zip(keys, row)) for row in result.all()])
+
+
+async def stream_validated(
+    session: AsyncSession, stmt: Select, adapter: TypeAdapter, batch_size: int
+) -> AsyncIterator[Any]:
+    result = await session.stream(stmt.execution_options(yield_per=batch_size))
+    keys = tuple(result.keys())
+    async for rows in result.partitions():
+        for item in adapter.validate_python([dict(zip(keys, row)) for row in rows]):
+            yield item
+
+
+async def table_version(session: AsyncSession, table_name: str) -> int:
+    stmt = select(TableVersion.version).where(TableVersion.table_name == table_name)
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none() or 0
@@ -0,0 +1,159 @@
+import functools
+import hashlib
+import inspect
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import Delete, Insert, Update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+_read_only: ContextVar[bool] = ContextVar("read_only", default=False)
+_primary_only: ContextVar[bool] = ContextVar("primary_only", default=False)
+
+# ASGI scope key under which ReadYourWritesMiddleware leaves the WriteMarker
+WRITE_MARKER_SCOPE_KEY = "write_marker"
+
+
+def read_only(method):
+    """Allow a repository method's queries to be served by a read replica."""
+    if inspect.isasyncgenfunction(method):
+
+        @functools.wraps(method)
+        async def generator_wrapper(*args, **kwargs):
+            # set the flag only while the generator runs, not while suspended
+            generator = method(*args, **kwargs)
+            try:
+                while True:
+                    token = _read_only.set(True)
+                    try:
+                        item = await generator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        _read_only.reset(token)
+                    yield item
+            finally:
+                await generator.aclose()
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+
+    return wrapper
+
+
+@contextmanager
+def primary_only(enabled: bool = True):
+    """Keep read-only methods on the primary, e.g. to refill a cache that
+    must not be populated from a lagging replica, or to check a row that is
+    about to be written. With ``enabled=False`` routing is left as is."""
+    if not enabled:
+        yield
+        return
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+def client_key(authorization: str | None) -> str | None:
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+class StickyWriters:
+    """Clients that wrote recently and must read from the primary for a while.
+
+    Kept in this process only: with several workers, a client's next request
+    may land on a worker that never saw the write. ``WriteMarker`` carries the
+    window across workers for clients that keep cookies; this map covers the
+    ones that do not, as long as they come back to the same worker.
+    """
+
+    def __init__(self, window: float, max_size: int = 100_000):
+        self._window = window
+        self._max_size = max_size
+        self._until: dict[str, float] = {}
+
+    def mark(self, key: str) -> None:
+        now = time.monotonic()
+        if len(self._until) >= self._max_size:
+            self._until = {k: v for k, v in self._until.items() if v > now}
+        self._until[key] = now + self._window
+
+    def is_sticky(self, key: str) -> bool:
+        until = self._until.get(key)
+        return until is not None and until > time.monotonic()
+
+
+class WriteMarker:
+    """Read-your-writes state of one request.
+
+    ``primary_until`` comes from the client (see ReadYourWritesMiddleware) and
+    is a wall-clock time, so every worker honours a window opened on another.
+    The session sets ``wrote`` so the window can be renewed on the response.
+    """
+
+    __slots__ = ("primary_until", "wrote")
+
+    def __init__(self, primary_until: float = 0):
+        self.primary_until = primary_until
+        self.wrote = False
+
+    def is_sticky(self) -> bool:
+        return self.primary_until > time.time()
+
+
+class RoutingSession(Session):
+    """Sends read-only queries to a replica, the rest to the primary.
+
+    Sessions take replicas round-robin, and each session keeps to the one it
+    took, so its reads agree with each other (an ETag version and the rows
+    served under it, for example). Once a session writes, it stays on the
+    primary so it reads its own writes, and the client (``info["client_key"]``)
+    is pinned to the primary for the sticky window: through the request's
+    ``info["write_marker"]`` on every worker, and through ``sticky_writers``
+    on this one.
+    """
+
+    primary: Engine
+    replicas: "itertools.cycle[Engine]"
+    sticky_writers: StickyWriters
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wrote = False
+        self._replica: Engine | None = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        key = self.info.get("client_key")
+        marker: WriteMarker | None = self.info.get("write_marker")
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self._wrote = True
+            if key is not None:
+                self.sticky_writers.mark(key)
+            if marker is not None:
+                marker.wrote = True
+            return self.primary
+        if (
+            _read_only.get()
+            and not _primary_only.get()
+            and not self._wrote
+            and not (key is not None and self.sticky_writers.is_sticky(key))
+            and not (marker is not None and marker.is_sticky())
+        ):
+            if self._replica is None:
+                self._replica = next(self.replicas)
+            return self._replica
+        return self.primary
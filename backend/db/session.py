@@ -2,20 +2,92 @@ import os
 import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import itertools
+from uuid import uuid4
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from api.core.config import get_settings
+from db.instrumentation import instrument_engine
+from db.pool import InstrumentedAsyncPool
+from db.routing import (
+    WRITE_MARKER_SCOPE_KEY,
+    RoutingSession,
+    StickyWriters,
+    client_key,
+)
 
 settings = get_settings()
 
-async_engine = create_async_engine(
-    settings.ASYNC_REAL_DATABASE_URL, future=True, echo=True
-)
 
-async_session = sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+def _connect_args() -> dict:
+    if settings.DB_PGBOUNCER:
+        # PgBouncer in transaction mode may hand each transaction a different
+        # server connection, so nothing can stay prepared between them.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        future=True,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_S,
+        pool_recycle=settings.DB_POOL_RECYCLE_S,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def make_session_factory(
+    primary: AsyncEngine, replicas: list[AsyncEngine]
+) -> sessionmaker:
+    if not replicas:
+        return sessionmaker(primary, expire_on_commit=False, class_=AsyncSession)
+
+    routing_session = type(
+        "PrimaryReplicaSession",
+        (RoutingSession,),
+        {
+            "primary": primary.sync_engine,
+            "replicas": itertools.cycle([r.sync_engine for r in replicas]),
+            "sticky_writers": StickyWriters(settings.REPLICA_STICKY_S),
+        },
+    )
+    return sessionmaker(
+        expire_on_commit=False, class_=AsyncSession, sync_session_class=routing_session
+    )
+
+
+async_engine = _create_engine(settings.ASYNC_REAL_DATABASE_URL)
+replica_engines = [
+    _create_engine(url.strip())
+    for url in settings.ASYNC_READ_REPLICA_URLS.split(",")
+    if url.strip()
+]
+
+async_session = make_session_factory(async_engine, replica_engines)
 
 
-async def get_session():
-    async with async_session() as session:
+async def get_session(request: Request = None):
+    key = client_key(request.headers.get("authorization")) if request else None
+    marker = request.scope.get(WRITE_MARKER_SCOPE_KEY) if request else None
+    async with async_session(
+        info={"client_key": key, "write_marker": marker}
+    ) as session:
         yield session
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,15 +7,54 @@ from fastapi.middleware.cors import CORSMiddleware
 from api.core.config import get_settings
 from api.core.logging.handlers import log_router
 from api.core.logging.logging_middleware import LoggingMiddleware
+from api.core.metrics import collectors  # noqa: F401
+from api.core.metrics.handlers import metrics_router
+from api.core.metrics.middleware import MetricsMiddleware
+from api.core.metrics.multiprocess import metrics_store
+from api.core.metrics.server_timing import ServerTimingMiddleware
+from api.core.read_your_writes import ReadYourWritesMiddleware
+from api.core.responses import FastJSONResponse
 from api.core.routers import router
+from api.v1.events.broker import EVENTS_CHANNEL, event_broker
+from api.v1.roles.registry import ROLES_CHANNEL, role_registry
+from db.listener import pg_listener
+from db.session import replica_engines
+from utils.hashing import hashing_pool
+from utils.pagination import NEXT_CURSOR_HEADER
 
 settings = get_settings()
 
-app = FastAPI(title=settings.PROJECT_NAME)
+pg_listener.subscribe(ROLES_CHANNEL, role_registry.invalidate)
+pg_listener.on_connect(role_registry.invalidate)
+pg_listener.subscribe(EVENTS_CHANNEL, event_broker.publish)
+pg_listener.on_connect(event_broker.resync)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    role_registry.invalidate()
+    pg_listener.start()
+    if metrics_store is not None:
+        metrics_store.start()
+    yield
+    event_broker.close()
+    if metrics_store is not None:
+        await metrics_store.stop()
+    await pg_listener.stop()
+    hashing_pool.shutdown()
+
+
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 
 app.include_router(router)
 app.include_router(log_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 
 app.openapi_schema = app.openapi()
 app.openapi_schema["components"]["securitySchemes"] = {
@@ -33,8 +74,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing", "ETag"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+if replica_engines:
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.REPLICA_STICKY_S)
+
+app.add_middleware(ServerTimingMiddleware)
 app.add_middleware(LoggingMiddleware)
 
 
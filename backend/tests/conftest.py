@@ -11,6 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from api.core.config import get_settings
+from db.instrumentation import instrument_engine
+from db.listener import pg_listener
 from db.session import get_session
 from main import app
 from tests.testDAL import TestDAL
@@ -26,6 +28,7 @@ USER_URL = "/users"
 DEVICE_URL = "/devices"
 ROLE_URL = "/roles"
 LOGIN_URL = "/auth"
+SYNC_URL = "/sync"
 
 
 # @pytest.fixture(scope="session")
@@ -74,6 +77,7 @@ async def _get_test_session():
     test_engine = create_async_engine(
         settings.TEST_DATABASE_URL, future=True, echo=True
     )
+    instrument_engine(test_engine.sync_engine)
     test_async_session = sessionmaker(
         test_engine, expire_on_commit=False, class_=AsyncSession
     )
@@ -82,13 +86,15 @@ async def _get_test_session():
 
 
 @pytest.fixture(scope="function")
-async def client() -> AsyncGenerator[TestClient, Any]:
+async def client(monkeypatch) -> AsyncGenerator[TestClient, Any]:
     """
     Create a new FastApi TestClient that uses the 'db_session' fixture to override
     the 'get_session' dependency that is injected into routers.
     """
 
     app.dependency_overrides[get_session] = _get_test_session
+    # the app's LISTEN connection must watch the database the tests write to
+    monkeypatch.setattr(pg_listener, "_dsn", DSN_FOR_TESTDAL)
     with TestClient(app=app) as client:
         yield client
 
@@ -155,10 +161,7 @@ async def create_role_in_database() -> Callable[[dict[str | list[dict[str]]]], s
 async def create_user_in_database() -> Callable[[dict[str | list[dict[str]]]], str]:
     async def create_user_in_database(user_info: dict) -> str:
         async with TestDAL(DSN_FOR_TESTDAL) as dal:
-            user_id = await dal.create_object_in_database("users", user_info)
-            full_name = f"{user_info.get('first_name', '')} {user_info.get('last_name', '')} {user_info.get('patronymic', '')}"
-            await dal.add_tsvector_to_obj("users", user_id, "full_name_tsv", full_name)
-            return user_id
+            return await dal.create_object_in_database("users", user_info)
 
     return create_user_in_database
 
@@ -90,19 +90,3 @@ class TestDAL:
         """
         async with self.pool.acquire() as connection:
             return await connection.fetchval(query, *values)
-
-    async def add_tsvector_to_obj(
-        self,
-        tablename: str,
-        obj_id: str | int,
-        tsvector_field: str,
-        tsvector_value: str,
-    ) -> None:
-        tsvector_sql = "to_tsvector('russian', $1)"
-        query = f"""
-            UPDATE {tablename}
-            SET {tsvector_field} = {tsvector_sql}
-            WHERE id = $2
-        """
-        async with self.pool.acquire() as connection:
-            await connection.execute(query, tsvector_value, obj_id)
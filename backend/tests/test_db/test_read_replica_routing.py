@@ -0,0 +1,167 @@
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from api.core.config import get_settings
+from api.core.read_your_writes import REPLICA_STICKY_COOKIE, ReadYourWritesMiddleware
+from api.v1.devices.schemas import CreateDevice
+from api.v1.devices.service import DeviceService
+from db.pool import InstrumentedAsyncPool
+from db.repositories.postgres.devicesRepo import PostgresDeviceRepo
+from db.routing import WRITE_MARKER_SCOPE_KEY, WriteMarker, primary_only
+from db.session import make_session_factory
+
+settings = get_settings()
+
+
+@pytest.fixture
+async def engines():
+    # both point at the test database; what matters is which pool is used
+    primary, replica = (
+        create_async_engine(settings.TEST_DATABASE_URL, poolclass=InstrumentedAsyncPool)
+        for _ in range(2)
+    )
+    yield primary, replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+def checkouts(engine) -> int:
+    return engine.sync_engine.pool.stats()["checkouts"]
+
+
+async def test_reads_go_to_replica_and_writes_to_primary(engines):
+    primary, replica = engines
+    session_factory = make_session_factory(primary, [replica])
+
+    async with session_factory(info={"client_key": "reader"}) as session:
+        await PostgresDeviceRepo(session).get_all()
+    assert (checkouts(primary), checkouts(replica)) == (0, 1)
+
+    async with session_factory(info={"client_key": "writer"}) as session:
+        repo = PostgresDeviceRepo(session)
+        device = await repo.create(
+            CreateDevice(name="Press", android_id="a3f9c2b7d18e44fa")
+        )
+        # the session wrote, so it reads its own write from the primary
+        assert await repo.get_by_id(device.id) is not None
+    assert checkouts(primary) >= 1
+    replica_before = checkouts(replica)
+
+    # the writer stays on the primary for REPLICA_STICKY_S
+    async with session_factory(info={"client_key": "writer"}) as session:
+        assert await PostgresDeviceRepo(session).get_by_id(device.id) is not None
+    assert checkouts(replica) == replica_before
+
+    async with session_factory(info={"client_key": "reader"}) as session:
+        await PostgresDeviceRepo(session).get_by_id(device.id)
+    assert checkouts(replica) == replica_before + 1
+
+
+async def test_primary_only_overrides_read_only(engines):
+    primary, replica = engines
+    session_factory = make_session_factory(primary, [replica])
+
+    async with session_factory() as session:
+        with primary_only():
+            await PostgresDeviceRepo(session).get_all()
+        await PostgresDeviceRepo(session).get_all()
+
+    assert (checkouts(primary), checkouts(replica)) == (1, 1)
+
+
+async def test_checks_before_writes_read_from_primary(engines):
+    primary, replica = engines
+    session_factory = make_session_factory(primary, [replica])
+
+    async with session_factory() as session:
+        service = DeviceService(PostgresDeviceRepo(session))
+        with pytest.raises(HTTPException):
+            await service.get_device_by_id(uuid4(), for_update=True)
+        with pytest.raises(HTTPException):
+            await service.delete_device_by_id(uuid4())
+    assert (checkouts(primary), checkouts(replica)) == (1, 0)
+
+    async with session_factory() as session:
+        with pytest.raises(HTTPException):
+            await DeviceService(PostgresDeviceRepo(session)).get_device_by_id(uuid4())
+    assert checkouts(replica) == 1
+
+
+async def test_stream_all_reads_from_replica(engines):
+    primary, replica = engines
+    session_factory = make_session_factory(primary, [replica])
+
+    async with session_factory() as session:
+        assert [d async for d in PostgresDeviceRepo(session).stream_all()] == []
+
+    assert (checkouts(primary), checkouts(replica)) == (0, 1)
+
+
+async def test_session_reads_from_one_replica(engines):
+    primary, replica = engines
+    other = create_async_engine(
+        settings.TEST_DATABASE_URL, poolclass=InstrumentedAsyncPool
+    )
+    session_factory = make_session_factory(primary, [replica, other])
+
+    try:
+        async with session_factory() as session:
+            repo = PostgresDeviceRepo(session)
+            await repo.get_version()
+            await repo.get_all()
+        assert (checkouts(replica), checkouts(other)) == (1, 0)
+
+        async with session_factory() as session:
+            await PostgresDeviceRepo(session).get_all()
+        assert (checkouts(replica), checkouts(other)) == (1, 1)
+    finally:
+        await other.dispose()
+
+
+async def test_write_marker_keeps_reads_on_primary(engines):
+    primary, replica = engines
+    session_factory = make_session_factory(primary, [replica])
+
+    # a window opened by a write on another worker
+    marker = WriteMarker(primary_until=time.time() + 60)
+    async with session_factory(info={"write_marker": marker}) as session:
+        await PostgresDeviceRepo(session).get_all()
+    assert (checkouts(primary), checkouts(replica)) == (1, 0)
+
+    marker = WriteMarker()
+    async with session_factory(info={"write_marker": marker}) as session:
+        await PostgresDeviceRepo(session).create(
+            CreateDevice(name="Press", android_id="a3f9c2b7d18e44fa")
+        )
+    assert marker.wrote
+
+
+def test_read_your_writes_cookie_round_trip():
+    markers = []
+
+    async def endpoint(request):
+        marker = request.scope[WRITE_MARKER_SCOPE_KEY]
+        markers.append(marker)
+        marker.wrote = request.method == "POST"
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/", endpoint, methods=["GET", "POST"])])
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+
+    with TestClient(app) as client:
+        assert REPLICA_STICKY_COOKIE not in client.get("/").cookies
+        assert not markers[-1].is_sticky()
+
+        resp = client.post("/")
+        assert float(resp.cookies[REPLICA_STICKY_COOKIE]) > time.time()
+
+        client.get("/")
+        assert markers[-1].is_sticky()
@@ -0,0 +1,102 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from api.core.config import get_settings
+from db.repositories.postgres.devicesRepo import PostgresDeviceRepo
+from db.repositories.postgres.roleRepo import PostgresRoleRepo
+from db.repositories.postgres.usersRepo import PostgresUserRepo
+
+settings = get_settings()
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(settings.TEST_DATABASE_URL)
+    yield engine
+    await engine.dispose()
+
+
+async def explain(engine, call) -> str:
+    """Plan of the last statement ``call`` runs, with seq scans discouraged
+    so that the tiny test tables still show whether an index is usable."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with AsyncSession(engine) as session:
+            await call(session)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        return "\n".join(row[0] for row in result)
+
+
+@pytest.mark.parametrize(
+    "call, index",
+    [
+        (
+            lambda s: PostgresDeviceRepo(s).get_by_name("Press", exact_match=True),
+            "ux_devices_name_lower",
+        ),
+        (
+            lambda s: PostgresRoleRepo(s).get_by_name("admin", exact_match=True),
+            "ux_roles_name_lower",
+        ),
+        (
+            lambda s: PostgresUserRepo(s).get_by_username("jdoe", exact_match=True),
+            "ux_users_username_lower",
+        ),
+    ],
+)
+async def test_exact_name_lookups_use_lower_indexes(engine, call, index):
+    assert index in await explain(engine, call)
+
+
+@pytest.mark.parametrize(
+    "call, index",
+    [
+        (lambda s: PostgresDeviceRepo(s).get_by_name("ress"), "ix_devices_name_trgm"),
+        (lambda s: PostgresRoleRepo(s).get_by_name("dmi"), "ix_roles_name_trgm"),
+        (lambda s: PostgresUserRepo(s).search("doe"), "ix_users_username_trgm"),
+    ],
+)
+async def test_substring_search_uses_trigram_indexes(engine, call, index):
+    assert index in await explain(engine, call)
+
+
+async def test_substring_search_matches_wildcards_literally(
+    engine, create_device_in_database
+):
+    for name, android_id in [("Press_1", "a3f9c2b7"), ("Press21", "b4e0d3c8")]:
+        await create_device_in_database(
+            {"id": uuid4(), "name": name, "android_id": android_id}
+        )
+
+    async with AsyncSession(engine) as session:
+        repo = PostgresDeviceRepo(session)
+        assert [d.name for d in await repo.get_by_name("s_1")] == ["Press_1"]
+        assert await repo.get_by_name("%") == []
+
+
+async def test_android_id_lookup_is_an_index_probe(engine):
+    plan = await explain(
+        engine, lambda s: PostgresDeviceRepo(s).get_by_android_id(" A3F9C2B7 ")
+    )
+
+    assert "lower(" not in plan
+    assert "ix_devices_android_id_hash" in plan or "devices_android_id_key" in plan
+
+
+async def test_users_by_role_use_role_ids_index(engine):
+    plan = await explain(engine, lambda s: PostgresUserRepo(s).get_by_role_id(uuid4()))
+    assert "ix_users_role_ids" in plan
@@ -1,12 +1,15 @@
+import asyncio
 import datetime
 from uuid import uuid4
 
+import asyncpg
 import pytest
 from jose import jwt
 
-from config.permissions import Permissions
-from tests.conftest import LOGIN_URL, VERSION_URL
+from config.permissions import Permissions, permissions_to_mask
+from tests.conftest import DEVICE_URL, DSN_FOR_TESTDAL, LOGIN_URL, VERSION_URL
 from utils.hashing import Hasher
+from utils.jwt import token_cache
 
 
 async def test_login_success(client, create_user_in_database, user_data):
@@ -179,6 +182,7 @@ async def test_login_response_shape(
     expected_permissions = set(role_info1["permissions"] + role_info2["permissions"])
     assert len(decoded["permissions"]) == len(expected_permissions)
     assert set(decoded["permissions"]) == expected_permissions
+    assert decoded["pmask"] == permissions_to_mask(expected_permissions)
 
     exp_timestamp = decoded["exp"]
     exp_dt = datetime.datetime.fromtimestamp(exp_timestamp, datetime.timezone.utc)
@@ -187,3 +191,145 @@ async def test_login_response_shape(
     delta = exp_dt - now
     assert delta.total_seconds() > 0
     assert delta.total_seconds() <= settings.TOKEN_EXPIRE_MINUTES * 60 + 20
+
+
+async def test_login_permissions_follow_role_changes(
+    client,
+    create_role_in_database,
+    create_user_in_database,
+    user_data,
+    get_project_settings,
+):
+    settings = await get_project_settings()
+    role_id = uuid4()
+    await create_role_in_database(
+        {"id": role_id, "name": "operator", "permissions": [Permissions.GET_DEVICES]}
+    )
+    await create_user_in_database(
+        {
+            "id": uuid4(),
+            "username": user_data["username"],
+            "first_name": "John",
+            "last_name": "Doe",
+            "password": Hasher.get_password_hash(user_data["password"]),
+            "role_ids": [str(role_id)],
+        }
+    )
+
+    async def login_permissions() -> set[str]:
+        response = client.post(
+            url=f"{VERSION_URL}{LOGIN_URL}",
+            data={"username": user_data["username"], "password": user_data["password"]},
+        )
+        assert response.status_code == 200
+        decoded = jwt.decode(
+            response.json()["access_token"],
+            settings.SECRET_KEY_FOR_ACCESS,
+            algorithms=[settings.ALGORITHM],
+        )
+        return set(decoded["permissions"])
+
+    assert await login_permissions() == {Permissions.GET_DEVICES}
+
+    # Changed behind the app's back: only the NOTIFY tells the worker about it.
+    connection = await asyncpg.connect(DSN_FOR_TESTDAL)
+    try:
+        await connection.execute(
+            "UPDATE roles SET permissions = $1 WHERE id = $2",
+            [Permissions.CREATE_DEVICE],
+            role_id,
+        )
+    finally:
+        await connection.close()
+
+    for _ in range(50):
+        if (permissions := await login_permissions()) == {Permissions.CREATE_DEVICE}:
+            break
+        await asyncio.sleep(0.1)
+    assert permissions == {Permissions.CREATE_DEVICE}
+
+
+async def test_permission_check_uses_permission_mask(client, get_project_settings):
+    settings = await get_project_settings()
+
+    def auth_headers(claims: dict) -> dict[str, str]:
+        expire = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            minutes=5
+        )
+        token = jwt.encode(
+            {"sub": "test@mail.ru", "exp": expire, **claims},
+            settings.SECRET_KEY_FOR_ACCESS,
+            algorithm=settings.ALGORITHM,
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    allowed = client.get(
+        f"{VERSION_URL}{DEVICE_URL}/",
+        headers=auth_headers({"pmask": permissions_to_mask([Permissions.GET_DEVICES])}),
+    )
+    # the mask wins over the names when both are present
+    denied = client.get(
+        f"{VERSION_URL}{DEVICE_URL}/",
+        headers=auth_headers(
+            {
+                "pmask": permissions_to_mask([Permissions.GET_USERS]),
+                "permissions": [Permissions.GET_DEVICES],
+            }
+        ),
+    )
+
+    if settings.ENABLE_PERMISSION_CHECK:
+        assert allowed.status_code == 200
+        assert denied.status_code == 403
+        assert denied.json() == {"detail": "Forbidden: insufficient permissions"}
+    else:
+        assert allowed.status_code == 200
+        assert denied.status_code == 200
+
+
+def _access_headers(settings, exp: datetime.datetime) -> dict[str, str]:
+    token = jwt.encode(
+        {"sub": "test@mail.ru", "exp": exp, "permissions": [Permissions.GET_DEVICES]},
+        settings.SECRET_KEY_FOR_ACCESS,
+        algorithm=settings.ALGORITHM,
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def test_verified_token_is_served_from_cache(client, get_project_settings):
+    settings = await get_project_settings()
+    headers = _access_headers(
+        settings,
+        datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=5),
+    )
+    before = token_cache.stats()
+
+    for _ in range(3):
+        assert (
+            client.get(f"{VERSION_URL}{DEVICE_URL}/", headers=headers).status_code
+            == 200
+        )
+
+    after = token_cache.stats()
+    if settings.ENABLE_PERMISSION_CHECK and settings.JWT_CACHE_SIZE > 0:
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 2
+
+
+async def test_cached_token_expires(client, get_project_settings):
+    settings = await get_project_settings()
+    exp = datetime.datetime.now(datetime.timezone.utc).replace(
+        microsecond=0
+    ) + datetime.timedelta(seconds=2)
+    headers = _access_headers(settings, exp)
+
+    assert client.get(f"{VERSION_URL}{DEVICE_URL}/", headers=headers).status_code == 200
+
+    # jose compares exp in whole seconds, so wait for the second after it
+    await asyncio.sleep(
+        (exp - datetime.datetime.now(datetime.timezone.utc)).total_seconds() + 1.1
+    )
+    response = client.get(f"{VERSION_URL}{DEVICE_URL}/", headers=headers)
+    if settings.ENABLE_PERMISSION_CHECK:
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Could not validate credentials"}
@@ -0,0 +1,114 @@
+from uuid import uuid4
+
+from config.permissions import Permissions
+from tests.conftest import DEVICE_URL, VERSION_URL
+from tests.utils_for_tests import create_auth_headers_for_user
+
+
+async def test_bulk_create_devices(client, get_device_from_database):
+    items = [
+        {"name": f"Plant device {i}", "android_id": f"b3f9c2b7d18e44f{i}"}
+        for i in range(5)
+    ]
+
+    resp = client.post(
+        f"{VERSION_URL}{DEVICE_URL}/bulk",
+        json={"items": items},
+        headers=await create_auth_headers_for_user([Permissions.CREATE_DEVICE]),
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["created"] == len(items)
+    assert data["failed"] == 0
+    for item, result in zip(items, data["results"]):
+        assert result["error"] is None
+        device_from_db = await get_device_from_database(result["id"])
+        assert device_from_db["name"] == item["name"]
+        assert device_from_db["android_id"] == item["android_id"]
+
+
+async def test_bulk_create_devices_reports_duplicates(
+    client, create_device_in_database
+):
+    await create_device_in_database(
+        {"id": uuid4(), "name": "Existing", "android_id": "a3f9c2b7d18e44fa"}
+    )
+    items = [
+        {"name": "existing", "android_id": "c3f9c2b7d18e44f0"},
+        {"name": "New 1", "android_id": "A3F9C2B7D18E44FA"},
+        {"name": "New 2", "android_id": "c3f9c2b7d18e44f2"},
+        {"name": "new 2", "android_id": "c3f9c2b7d18e44f3"},
+        {"name": "New 3", "android_id": "c3f9c2b7d18e44f2"},
+    ]
+
+    resp = client.post(
+        f"{VERSION_URL}{DEVICE_URL}/bulk",
+        json={"items": items},
+        headers=await create_auth_headers_for_user([Permissions.CREATE_DEVICE]),
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["created"] == 1
+    assert data["failed"] == 4
+    errors = [result["error"] for result in data["results"]]
+    assert errors == [
+        "Device with name existing already exists",
+        "Device with android_id A3F9C2B7D18E44FA already exists",
+        None,
+        "Device with name new 2 is repeated in batch",
+        "Device with android_id c3f9c2b7d18e44f2 is repeated in batch",
+    ]
+    assert data["results"][2]["id"] is not None
+
+
+async def test_bulk_create_devices_rejected_item_claims_nothing(client):
+    items = [
+        {"name": "Press", "android_id": "c3f9c2b7d18e44f0"},
+        {"name": "press", "android_id": "c3f9c2b7d18e44f1"},
+        {"name": "Lathe", "android_id": "c3f9c2b7d18e44f1"},
+    ]
+
+    resp = client.post(
+        f"{VERSION_URL}{DEVICE_URL}/bulk",
+        json={"items": items},
+        headers=await create_auth_headers_for_user([Permissions.CREATE_DEVICE]),
+    )
+
+    assert resp.status_code == 200
+    assert [result["error"] for result in resp.json()["results"]] == [
+        None,
+        "Device with name press is repeated in batch",
+        None,
+    ]
+
+
+async def test_bulk_create_devices_validation(client):
+    resp = client.post(
+        f"{VERSION_URL}{DEVICE_URL}/bulk",
+        json={"items": [{"name": "", "android_id": "a3f9c2b7d18e44fa"}]},
+        headers=await create_auth_headers_for_user([Permissions.CREATE_DEVICE]),
+    )
+    assert resp.status_code == 422
+
+    resp = client.post(
+        f"{VERSION_URL}{DEVICE_URL}/bulk",
+        json={"items": []},
+        headers=await create_auth_headers_for_user([Permissions.CREATE_DEVICE]),
+    )
+    assert resp.status_code == 422
+
+
+async def test_bulk_create_devices_no_permission(client, get_project_settings):
+    resp = client.post(
+        f"{VERSION_URL}{DEVICE_URL}/bulk",
+        json={"items": [{"name": "Test", "android_id": "abcd"}]},
+        headers=await create_auth_headers_for_user([Permissions.GET_DEVICES]),
+    )
+    settings = await get_project_settings()
+    if settings.ENABLE_PERMISSION_CHECK:
+        assert resp.status_code == 403
+        assert resp.json() == {"detail": "Forbidden: insufficient permissions"}
+    else:
+        assert resp.status_code == 200
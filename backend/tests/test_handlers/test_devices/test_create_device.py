@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from uuid import uuid4
 
@@ -79,6 +80,38 @@ async def test_create_device_duplicate_android_id_case_insensitive(
     assert resp.json() == {"detail": f"Device with android_id {new} already exists"}
 
 
+async def test_create_device_stores_normalized_android_id(client):
+    resp = client.post(
+        f"{VERSION_URL}{DEVICE_URL}/",
+        json={"name": "Press", "android_id": "  A3F9C2B7D18E44FA "},
+        headers=await create_auth_headers_for_user([Permissions.CREATE_DEVICE]),
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["android_id"] == "a3f9c2b7d18e44fa"
+
+
+async def test_create_device_concurrent_duplicates(client):
+    headers = await create_auth_headers_for_user([Permissions.CREATE_DEVICE])
+
+    def create(index: int):
+        return client.post(
+            f"{VERSION_URL}{DEVICE_URL}/",
+            json={"name": f"Line {index}", "android_id": "a3f9c2b7d18e44fa"},
+            headers=headers,
+        )
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        responses = list(pool.map(create, range(5)))
+
+    assert sorted(resp.status_code for resp in responses) == [200, 400, 400, 400, 400]
+    for resp in responses:
+        if resp.status_code == 400:
+            assert resp.json() == {
+                "detail": "Device with android_id a3f9c2b7d18e44fa already exists"
+            }
+
+
 async def test_create_device_not_authenticated(client, get_project_settings):
     resp = client.post(
         f"{VERSION_URL}{DEVICE_URL}/",
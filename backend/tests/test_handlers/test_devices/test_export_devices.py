@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+from config.permissions import Permissions
+from tests.conftest import DEVICE_URL, VERSION_URL
+from tests.utils_for_tests import _create_devices, create_auth_headers_for_user
+
+
+async def test_export_devices_ndjson(client, create_device_in_database):
+    devices = await _create_devices(create_device_in_database)
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.get(f"{VERSION_URL}{DEVICE_URL}/export", headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["id"] for row in rows] == sorted(str(d["id"]) for d in devices)
+    assert {row["android_id"] for row in rows} == {d["android_id"] for d in devices}
+
+
+async def test_export_devices_csv(client, create_device_in_database):
+    devices = await _create_devices(create_device_in_database)
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.get(f"{VERSION_URL}{DEVICE_URL}/export?format=csv", headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == len(devices)
+    assert set(rows[0].keys()) == {"id", "name", "android_id"}
+
+
+async def test_export_devices_empty(client):
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.get(f"{VERSION_URL}{DEVICE_URL}/export", headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.text == ""
+
+
+async def test_export_devices_forbidden(client, get_project_settings):
+    headers = await create_auth_headers_for_user([Permissions.CREATE_DEVICE])
+
+    resp = client.get(f"{VERSION_URL}{DEVICE_URL}/export", headers=headers)
+    settings = await get_project_settings()
+    if settings.ENABLE_PERMISSION_CHECK:
+        assert resp.status_code == 403
+        assert resp.json() == {"detail": "Forbidden: insufficient permissions"}
+    else:
+        assert resp.status_code == 200
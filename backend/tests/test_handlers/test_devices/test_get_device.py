@@ -136,6 +136,36 @@ async def test_get_all_devices(client, create_device_in_database):
     assert len(data) == len(devices)
 
 
+async def test_get_all_devices_paginated(client, create_device_in_database):
+    devices = await _create_devices(create_device_in_database)
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.get(f"{VERSION_URL}{DEVICE_URL}/?limit=2", headers=headers)
+    assert resp.status_code == 200
+    first_page = resp.json()
+    assert len(first_page) == 2
+    cursor = resp.headers["X-Next-Cursor"]
+
+    resp = client.get(
+        f"{VERSION_URL}{DEVICE_URL}/?limit=2&after={cursor}", headers=headers
+    )
+    assert resp.status_code == 200
+    second_page = resp.json()
+    assert len(second_page) == 1
+    assert "X-Next-Cursor" not in resp.headers
+
+    returned_ids = [device["id"] for device in first_page + second_page]
+    assert returned_ids == sorted(str(device["id"]) for device in devices)
+
+
+async def test_get_all_devices_invalid_cursor(client):
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.get(f"{VERSION_URL}{DEVICE_URL}/?after=not-a-cursor", headers=headers)
+    assert resp.status_code == 422
+    assert resp.json() == {"detail": "Invalid pagination cursor"}
+
+
 async def test_get_devices_by_name_exact_match(client, create_device_in_database):
     await _create_devices(create_device_in_database)
     headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
@@ -172,6 +202,17 @@ async def test_get_devices_by_name_partial_match(client, create_device_in_databa
     assert len(data) >= 1
 
 
+async def test_get_devices_by_name_respects_limit(client, create_device_in_database):
+    await _create_devices(create_device_in_database)
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.get(
+        f"{VERSION_URL}{DEVICE_URL}/?device_name=Test&limit=2", headers=headers
+    )
+    assert resp.status_code == 200
+    assert [d["name"] for d in resp.json()] == ["Test Device 1", "Test Device 2"]
+
+
 async def test_get_devices_no_results(client, create_device_in_database):
     await _create_devices(create_device_in_database)
     headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
@@ -237,3 +278,115 @@ async def test_get_devices_wrong_token(
         assert resp.json() == {"detail": "Could not validate credentials"}
     else:
         assert resp.status_code == 200
+
+
+async def test_get_devices_not_modified_until_a_write(
+    client, create_device_in_database
+):
+    await create_device_in_database(
+        {"id": uuid4(), "name": "Press", "android_id": "a3f9c2b7d18e44fa"}
+    )
+    headers = await create_auth_headers_for_user(
+        [Permissions.GET_DEVICES, Permissions.CREATE_DEVICE]
+    )
+
+    resp = client.get(f"{VERSION_URL}{DEVICE_URL}/", headers=headers)
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+
+    resp = client.get(
+        f"{VERSION_URL}{DEVICE_URL}/", headers={**headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["ETag"] == etag
+    assert 'desc="1 queries"' in resp.headers["Server-Timing"]
+
+    client.post(
+        f"{VERSION_URL}{DEVICE_URL}/",
+        json={"name": "Lathe", "android_id": "b4e0d3c8e29f55ab"},
+        headers=headers,
+    )
+    resp = client.get(
+        f"{VERSION_URL}{DEVICE_URL}/", headers={**headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+    assert len(resp.json()) == 2
+    assert resp.headers["ETag"] != etag
+
+
+async def test_get_device_not_modified(client, create_device_in_database):
+    device_id = uuid4()
+    await create_device_in_database(
+        {"id": device_id, "name": "Press", "android_id": "a3f9c2b7d18e44fa"}
+    )
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+    url = f"{VERSION_URL}{DEVICE_URL}/{device_id}"
+
+    etag = client.get(url, headers=headers).headers["ETag"]
+    collection_etag = client.get(
+        f"{VERSION_URL}{DEVICE_URL}/", headers=headers
+    ).headers["ETag"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        resp = client.get(url, headers={**headers, "If-None-Match": if_none_match})
+        assert resp.status_code == 304
+    for if_none_match in ('"devices-0"', collection_etag):
+        resp = client.get(url, headers={**headers, "If-None-Match": if_none_match})
+        assert resp.status_code == 200
+
+
+async def test_get_missing_device_is_never_not_modified(
+    client, create_device_in_database
+):
+    await create_device_in_database(
+        {"id": uuid4(), "name": "Press", "android_id": "a3f9c2b7d18e44fa"}
+    )
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+    collection_etag = client.get(
+        f"{VERSION_URL}{DEVICE_URL}/", headers=headers
+    ).headers["ETag"]
+    url = f"{VERSION_URL}{DEVICE_URL}/{uuid4()}"
+
+    for if_none_match in ("*", collection_etag):
+        resp = client.get(url, headers={**headers, "If-None-Match": if_none_match})
+        assert resp.status_code == 404
+
+
+async def test_batch_get_devices(client, create_device_in_database):
+    device_ids = [uuid4(), uuid4()]
+    for i, device_id in enumerate(device_ids):
+        await create_device_in_database(
+            {"id": device_id, "name": f"device {i}", "android_id": f"android{i}"}
+        )
+    missing_id = uuid4()
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.post(
+        f"{VERSION_URL}{DEVICE_URL}/batch-get",
+        json={"ids": [str(device_ids[0]), str(missing_id), str(device_ids[1])]},
+        headers=headers,
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["items"] == {
+        str(device_id): {
+            "id": str(device_id),
+            "name": f"device {i}",
+            "android_id": f"android{i}",
+        }
+        for i, device_id in enumerate(device_ids)
+    }
+    assert data["missing"] == [str(missing_id)]
+
+
+@pytest.mark.parametrize("ids", [[], ["not-a-uuid"]])
+async def test_batch_get_devices_invalid_ids(client, ids):
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.post(
+        f"{VERSION_URL}{DEVICE_URL}/batch-get", json={"ids": ids}, headers=headers
+    )
+
+    assert resp.status_code == 422
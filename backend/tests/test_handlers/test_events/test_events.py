@@ -0,0 +1,122 @@
+import asyncio
+import json
+from uuid import uuid4
+
+from api.core.config import get_settings
+from api.v1.events.broker import (
+    EVICTED_FRAME,
+    HEARTBEAT_FRAME,
+    EventBroker,
+    event_broker,
+)
+from config.permissions import Permissions
+from db.listener import PgListener
+from tests.conftest import VERSION_URL
+from tests.utils_for_tests import create_auth_headers_for_user
+
+settings = get_settings()
+
+EVENTS_URL = "/events"
+
+
+def parse_frame(frame: bytes) -> tuple[str, dict]:
+    event, data = frame.decode().strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+async def test_broker_fans_out_to_every_subscriber():
+    broker = EventBroker(queue_size=10, max_subscribers=10)
+    streams = [broker.stream(broker.subscribe(), heartbeat=5) for _ in range(3)]
+    for stream in streams:
+        assert await anext(stream) == HEARTBEAT_FRAME
+
+    broker.publish('{"table": "roles", "op": "update", "id": "1"}')
+
+    for stream in streams:
+        assert parse_frame(await anext(stream)) == (
+            "roles",
+            {"table": "roles", "op": "update", "id": "1"},
+        )
+    broker.close()
+    for stream in streams:
+        assert [frame async for frame in stream] == []
+    assert broker.stats()["subscribers"] == 0
+
+
+async def test_broker_evicts_slow_consumer():
+    broker = EventBroker(queue_size=2, max_subscribers=10)
+    slow, fast = broker.stream(broker.subscribe(), heartbeat=5), broker.stream(
+        broker.subscribe(), heartbeat=5
+    )
+    await anext(slow)
+    await anext(fast)
+
+    for n in range(3):
+        broker.publish(json.dumps({"table": "devices", "op": "insert", "id": n}))
+        await anext(fast)
+
+    assert [frame async for frame in slow] == [EVICTED_FRAME]
+    assert broker.stats() == {"subscribers": 1, "published": 3, "evictions": 1}
+    await fast.aclose()
+
+
+async def test_broker_sends_heartbeats_while_idle():
+    broker = EventBroker(queue_size=2, max_subscribers=10)
+    stream = broker.stream(broker.subscribe(), heartbeat=0.01)
+
+    assert [await anext(stream) for _ in range(3)] == [HEARTBEAT_FRAME] * 3
+    await stream.aclose()
+
+
+async def test_device_change_is_pushed_through_listen(create_device_in_database):
+    broker = EventBroker(queue_size=10, max_subscribers=10)
+    listener = PgListener(settings.TEST_DATABASE_URL, reconnect_delay=0.1)
+    listener.subscribe("entity_changes", broker.publish)
+    stream = broker.stream(broker.subscribe(), heartbeat=5)
+    await anext(stream)
+    listener.start()
+    try:
+        for _ in range(100):
+            if listener.connected:
+                break
+            await asyncio.sleep(0.05)
+        device_id = uuid4()
+        await create_device_in_database(
+            {"id": device_id, "name": "Press", "android_id": "a3f9c2b7d18e44fa"}
+        )
+
+        frame = await asyncio.wait_for(anext(stream), 5)
+    finally:
+        await listener.stop()
+        await stream.aclose()
+
+    assert parse_frame(frame) == (
+        "devices",
+        {"table": "devices", "op": "insert", "id": str(device_id)},
+    )
+
+
+async def test_stream_events_rejects_when_full(client, monkeypatch):
+    monkeypatch.setattr(event_broker, "_max_subscribers", 0)
+    headers = await create_auth_headers_for_user(
+        [Permissions.GET_ROLES, Permissions.GET_DEVICES, Permissions.GET_USERS]
+    )
+
+    resp = client.get(f"{VERSION_URL}{EVENTS_URL}/", headers=headers)
+
+    assert resp.status_code == 503
+    assert resp.json() == {"detail": "Too many event subscribers."}
+
+
+async def test_stream_events_requires_every_read_permission(
+    client, get_project_settings
+):
+    settings = await get_project_settings()
+    if not settings.ENABLE_PERMISSION_CHECK:
+        return
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.get(f"{VERSION_URL}{EVENTS_URL}/", headers=headers)
+
+    assert resp.status_code == 403
+    assert resp.json() == {"detail": "Forbidden: insufficient permissions"}
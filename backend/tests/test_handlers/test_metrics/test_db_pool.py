@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from api.core.config import get_settings
+from api.core.metrics import handlers as metrics_handlers
+from db.pool import InstrumentedAsyncPool
+
+settings = get_settings()
+
+
+async def test_db_pool_stats_endpoint(client):
+    resp = client.get("/metrics/db-pool")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["replicas"] == []
+    assert set(data["primary"]) == {
+        "size",
+        "checked_in",
+        "checked_out",
+        "overflow",
+        "max_overflow",
+        "checkouts",
+        "timeouts",
+        "total_wait_s",
+        "max_wait_s",
+    }
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/metrics/db-pool"])
+async def test_metrics_endpoints_require_token_when_set(client, monkeypatch, path):
+    monkeypatch.setattr(metrics_handlers.settings, "METRICS_TOKEN", "scrape-token")
+
+    missing = client.get(path)
+    wrong = client.get(path, headers={"Authorization": "Bearer other"})
+    right = client.get(path, headers={"Authorization": "Bearer scrape-token"})
+
+    assert (missing.status_code, wrong.status_code) == (401, 401)
+    assert right.status_code == 200
+
+
+async def test_instrumented_pool_records_waits_and_timeouts():
+    engine = create_async_engine(
+        settings.TEST_DATABASE_URL,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2,
+    )
+    pool = engine.sync_engine.pool
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert pool.stats()["checked_out"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = pool.stats()
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["max_wait_s"] >= 0.2
+    finally:
+        await engine.dispose()
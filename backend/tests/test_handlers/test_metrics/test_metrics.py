@@ -0,0 +1,117 @@
+import asyncio
+import json
+import os
+
+from api.core.metrics.multiprocess import MetricsFileStore
+from api.core.metrics.registry import MetricsRegistry
+from config.permissions import Permissions
+from tests.conftest import DEVICE_URL, VERSION_URL
+from tests.utils_for_tests import create_auth_headers_for_user
+
+
+async def test_metrics_exposes_route_templates(client, create_device_in_database):
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+    for _ in range(3):
+        client.get(f"{VERSION_URL}{DEVICE_URL}/", headers=headers)
+    client.get(
+        f"{VERSION_URL}{DEVICE_URL}/0190c7a4-0000-7000-8000-000000000000",
+        headers=headers,
+    )
+    client.get("/no/such/path")
+
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert "# TYPE http_requests_total counter" in body
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert "# TYPE http_response_size_bytes histogram" in body
+    assert "# TYPE http_requests_in_progress gauge" in body
+    assert 'route="/v1/devices/",status="200"' in body
+    assert 'route="/v1/devices/{device_id}",status="404"' in body
+    assert 'route="<unmatched>",status="404"' in body
+    assert "0190c7a4" not in body
+    assert (
+        'http_request_duration_seconds_bucket{method="GET",route="/v1/devices/",'
+        'status="200",le="+Inf"}'
+    ) in body
+    assert 'app_component_stats{component="hashing_pool",stat="workers"}' in body
+
+
+def test_metrics_file_store_merges_workers(tmp_path):
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    in_progress = registry.gauge("in_progress", "In progress.", multiprocess_mode="sum")
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc(("/a",), 2)
+    in_progress.inc()
+    latency.observe((), 0.05)
+
+    # snapshot left behind by a worker that has already exited
+    dead_worker = {
+        "pid": 2**22 + 1,
+        "metrics": {
+            "requests_total": {json.dumps(["/a"]): 3},
+            "in_progress": {json.dumps([]): 5},
+            "latency_seconds": {json.dumps([]): [0, 1, 0, 0.5]},
+        },
+    }
+    (tmp_path / "metrics-dead.json").write_text(json.dumps(dead_worker))
+
+    body = MetricsFileStore(registry, str(tmp_path), interval=1).render()
+
+    assert 'requests_total{route="/a"} 5' in body
+    assert "in_progress 1" in body
+    assert 'latency_seconds_bucket{le="0.1"} 1' in body
+    assert 'latency_seconds_bucket{le="1"} 2' in body
+    assert "latency_seconds_count 2" in body
+    assert "latency_seconds_sum 0.55" in body
+
+
+def test_metrics_file_store_merges_gauges_by_mode(tmp_path):
+    registry = MetricsRegistry()
+    gauges = {
+        mode: registry.gauge(f"pool_{mode}", "Pool size.", multiprocess_mode=mode)
+        for mode in ("liveall", "max", "min")
+    }
+    for gauge in gauges.values():
+        gauge.set((), 4)
+
+    # another worker that is still running
+    other = os.getppid()
+    snapshot = {f"pool_{mode}": {json.dumps([]): 10} for mode in gauges}
+    (tmp_path / f"metrics-{other}.json").write_text(
+        json.dumps({"pid": other, "metrics": snapshot})
+    )
+
+    body = MetricsFileStore(registry, str(tmp_path), interval=1).render()
+
+    assert f'pool_liveall{{pid="{os.getpid()}"}} 4' in body
+    assert f'pool_liveall{{pid="{other}"}} 10' in body
+    assert "pool_max 10" in body
+    assert "pool_min 4" in body
+
+
+async def test_metrics_file_store_keeps_flushing_after_error(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.")
+    calls = []
+
+    def flaky_collector():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("dictionary changed size during iteration")
+
+    registry.add_collector(flaky_collector)
+    store = MetricsFileStore(registry, str(tmp_path), interval=0.01)
+    store.start()
+    try:
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if list(tmp_path.glob("metrics-*.json")):
+                break
+        assert list(tmp_path.glob("metrics-*.json"))
+        assert len(calls) > 1
+    finally:
+        await store.stop()
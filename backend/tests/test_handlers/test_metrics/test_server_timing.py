@@ -0,0 +1,53 @@
+import logging
+import re
+from uuid import uuid4
+
+from config.permissions import Permissions
+from tests.conftest import DEVICE_URL, VERSION_URL
+from tests.utils_for_tests import create_auth_headers_for_user
+
+SERVER_TIMING = re.compile(
+    r'db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", app;dur=(?P<app>[\d.]+)'
+)
+
+
+async def test_server_timing_counts_queries(client, create_device_in_database):
+    device_id = uuid4()
+    await create_device_in_database(
+        {"id": device_id, "name": "Press", "android_id": "a3f9c2b7d18e44fa"}
+    )
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.get(f"{VERSION_URL}{DEVICE_URL}/{device_id}", headers=headers)
+
+    assert resp.status_code == 200
+    timing = SERVER_TIMING.fullmatch(resp.headers["Server-Timing"])
+    assert timing is not None
+    # the table version for the ETag, then the row
+    assert int(timing["queries"]) == 2
+    assert float(timing["db"]) <= float(timing["app"])
+
+
+async def test_server_timing_without_queries(client):
+    resp = client.get("/")
+
+    timing = SERVER_TIMING.fullmatch(resp.headers["Server-Timing"])
+    assert timing is not None
+    assert int(timing["queries"]) == 0
+
+
+async def test_slow_queries_are_logged(client, caplog, monkeypatch):
+    from db import instrumentation
+
+    monkeypatch.setattr(instrumentation.settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    # alembic's fileConfig in the migrations fixture disables existing loggers
+    monkeypatch.setattr(instrumentation.slow_query_logger, "disabled", False)
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    with caplog.at_level(logging.WARNING, logger="slow_query"):
+        client.get(f"{VERSION_URL}{DEVICE_URL}/{uuid4()}", headers=headers)
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "slow_query"]
+    assert len(messages) == 2
+    assert "FROM table_versions" in messages[0]
+    assert "FROM devices" in messages[1]
@@ -0,0 +1,42 @@
+import csv
+import io
+import json
+
+from config.permissions import Permissions
+from tests.conftest import ROLE_URL, VERSION_URL
+from tests.utils_for_tests import _create_roles, create_auth_headers_for_user
+
+
+async def test_export_roles_ndjson(client, create_role_in_database):
+    roles = await _create_roles(create_role_in_database)
+    headers = await create_auth_headers_for_user([Permissions.GET_ROLES])
+
+    resp = client.get(f"{VERSION_URL}{ROLE_URL}/export", headers=headers)
+
+    assert resp.status_code == 200
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["id"] for row in rows] == sorted(str(r["id"]) for r in roles)
+    assert {row["name"]: row["permissions"] for row in rows} == {
+        r["name"]: r["permissions"] for r in roles
+    }
+
+
+async def test_export_roles_csv(client, create_role_in_database):
+    roles = await _create_roles(create_role_in_database)
+    headers = await create_auth_headers_for_user([Permissions.GET_ROLES])
+
+    resp = client.get(f"{VERSION_URL}{ROLE_URL}/export?format=csv", headers=headers)
+
+    assert resp.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert {row["name"]: json.loads(row["permissions"]) for row in rows} == {
+        r["name"]: r["permissions"] for r in roles
+    }
+
+
+async def test_export_roles_invalid_format(client):
+    headers = await create_auth_headers_for_user([Permissions.GET_ROLES])
+
+    resp = client.get(f"{VERSION_URL}{ROLE_URL}/export?format=xml", headers=headers)
+
+    assert resp.status_code == 422
@@ -172,6 +172,28 @@ async def test_get_all_roles(client, create_role_in_database):
     assert len(data) == len(roles)
 
 
+async def test_get_all_roles_paginated(client, create_role_in_database):
+    roles = await _create_roles(create_role_in_database)
+    headers = await create_auth_headers_for_user([Permissions.GET_ROLES])
+
+    resp = client.get(f"{VERSION_URL}{ROLE_URL}/?limit=2", headers=headers)
+    assert resp.status_code == 200
+    first_page = resp.json()
+    assert len(first_page) == 2
+    cursor = resp.headers["X-Next-Cursor"]
+
+    resp = client.get(
+        f"{VERSION_URL}{ROLE_URL}/?limit=2&after={cursor}", headers=headers
+    )
+    assert resp.status_code == 200
+    second_page = resp.json()
+    assert len(second_page) == 1
+    assert "X-Next-Cursor" not in resp.headers
+
+    returned_ids = [role["id"] for role in first_page + second_page]
+    assert returned_ids == sorted(str(role["id"]) for role in roles)
+
+
 async def test_get_roles_by_name_exact_match(client, create_role_in_database):
     await _create_roles(create_role_in_database)
     headers = await create_auth_headers_for_user([Permissions.GET_ROLES])
@@ -208,6 +230,16 @@ async def test_get_roles_by_name_partial_match(client, create_role_in_database):
     assert data[0]["name"] == "SuperUser"
 
 
+async def test_get_roles_by_name_respects_limit(client, create_role_in_database):
+    await _create_roles(create_role_in_database)
+    headers = await create_auth_headers_for_user([Permissions.GET_ROLES])
+
+    resp = client.get(f"{VERSION_URL}{ROLE_URL}/?role_name=er&limit=1", headers=headers)
+
+    assert resp.status_code == 200
+    assert [role["name"] for role in resp.json()] == ["SuperUser"]
+
+
 async def test_get_roles_no_results(client, create_role_in_database):
     await _create_roles(create_role_in_database)
     headers = await create_auth_headers_for_user([Permissions.GET_ROLES])
@@ -277,3 +309,30 @@ async def test_get_roles_wrong_token(
         assert resp.json() == {"detail": "Could not validate credentials"}
     else:
         assert resp.status_code == 200
+
+
+async def test_batch_get_roles(client, create_role_in_database):
+    role_id = uuid4()
+    await create_role_in_database(
+        {"id": role_id, "name": "cook", "permissions": [Permissions.GET_DEVICES]}
+    )
+    missing_id = uuid4()
+    headers = await create_auth_headers_for_user([Permissions.GET_ROLES])
+
+    resp = client.post(
+        f"{VERSION_URL}{ROLE_URL}/batch-get",
+        json={"ids": [str(role_id), str(missing_id), str(role_id)]},
+        headers=headers,
+    )
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "items": {
+            str(role_id): {
+                "id": str(role_id),
+                "name": "cook",
+                "permissions": [Permissions.GET_DEVICES],
+            }
+        },
+        "missing": [str(missing_id)],
+    }
@@ -0,0 +1,95 @@
+from uuid import uuid4
+
+import pytest
+
+from config.permissions import Permissions
+from tests.conftest import ROLE_URL, VERSION_URL
+from tests.utils_for_tests import create_auth_headers_for_user
+
+READ_PERMISSIONS = [Permissions.GET_ROLES, Permissions.GET_USERS]
+
+
+async def _create_users_with_roles(create_user_in_database, role_ids_per_user):
+    user_ids = []
+    for i, role_ids in enumerate(role_ids_per_user):
+        user_ids.append(
+            await create_user_in_database(
+                {
+                    "id": uuid4(),
+                    "username": f"user{i}",
+                    "first_name": "First",
+                    "last_name": "Last",
+                    "password": "Pass123!",
+                    "role_ids": [str(role_id) for role_id in role_ids],
+                }
+            )
+        )
+    return user_ids
+
+
+async def test_get_role_users(client, create_role_in_database, create_user_in_database):
+    role_id, other_role_id = uuid4(), uuid4()
+    await create_role_in_database({"id": role_id, "name": "cook", "permissions": []})
+    await create_role_in_database(
+        {"id": other_role_id, "name": "waiter", "permissions": []}
+    )
+    user_ids = await _create_users_with_roles(
+        create_user_in_database,
+        [[role_id], [other_role_id], [other_role_id, role_id], []],
+    )
+    headers = await create_auth_headers_for_user(READ_PERMISSIONS)
+
+    resp = client.get(f"{VERSION_URL}{ROLE_URL}/{role_id}/users", headers=headers)
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [user["id"] for user in data] == sorted(
+        str(user_id) for user_id in (user_ids[0], user_ids[2])
+    )
+    assert all("password" not in user for user in data)
+
+
+async def test_get_role_users_paginated(
+    client, create_role_in_database, create_user_in_database
+):
+    role_id = uuid4()
+    await create_role_in_database({"id": role_id, "name": "cook", "permissions": []})
+    user_ids = await _create_users_with_roles(create_user_in_database, [[role_id]] * 3)
+    headers = await create_auth_headers_for_user(READ_PERMISSIONS)
+    url = f"{VERSION_URL}{ROLE_URL}/{role_id}/users"
+
+    resp = client.get(f"{url}?limit=2", headers=headers)
+    assert resp.status_code == 200
+    first_page = [user["id"] for user in resp.json()]
+    cursor = resp.headers["X-Next-Cursor"]
+
+    resp = client.get(f"{url}?limit=2&after={cursor}", headers=headers)
+    assert resp.status_code == 200
+    second_page = [user["id"] for user in resp.json()]
+    assert "X-Next-Cursor" not in resp.headers
+
+    assert first_page + second_page == sorted(str(user_id) for user_id in user_ids)
+
+
+async def test_get_role_users_role_not_found(client):
+    headers = await create_auth_headers_for_user(READ_PERMISSIONS)
+
+    resp = client.get(f"{VERSION_URL}{ROLE_URL}/{uuid4()}/users", headers=headers)
+
+    assert resp.status_code == 404
+    assert resp.json() == {"detail": "Role with this id not found"}
+
+
+@pytest.mark.parametrize("permission", READ_PERMISSIONS)
+async def test_get_role_users_requires_both_read_permissions(
+    client, get_project_settings, permission
+):
+    settings = await get_project_settings()
+    if not settings.ENABLE_PERMISSION_CHECK:
+        return
+    headers = await create_auth_headers_for_user([permission])
+
+    resp = client.get(f"{VERSION_URL}{ROLE_URL}/{uuid4()}/users", headers=headers)
+
+    assert resp.status_code == 403
+    assert resp.json() == {"detail": "Forbidden: insufficient permissions"}
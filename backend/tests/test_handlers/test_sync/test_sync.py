@@ -0,0 +1,112 @@
+import base64
+from uuid import uuid4
+
+import pytest
+
+from config.permissions import Permissions
+from tests.conftest import DEVICE_URL, ROLE_URL, SYNC_URL, USER_URL, VERSION_URL
+from tests.utils_for_tests import create_auth_headers_for_user
+
+SYNC_PERMISSIONS = [
+    Permissions.GET_USERS,
+    Permissions.GET_ROLES,
+    Permissions.GET_DEVICES,
+]
+
+
+def sync(client, headers, since=None, limit=None):
+    params = {k: v for k, v in {"since": since, "limit": limit}.items() if v}
+    resp = client.get(f"{VERSION_URL}{SYNC_URL}/", params=params, headers=headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+async def test_sync_returns_changes_since_token(client, create_device_in_database):
+    kept_id, deleted_id = uuid4(), uuid4()
+    await create_device_in_database(
+        {"id": kept_id, "name": "Press", "android_id": "a3f9c2b7d18e44fa"}
+    )
+    await create_device_in_database(
+        {"id": deleted_id, "name": "Lathe", "android_id": "b4e0d3c8e29f55ab"}
+    )
+    headers = await create_auth_headers_for_user(
+        SYNC_PERMISSIONS + [Permissions.UPDATE_DEVICE, Permissions.DELETE_DEVICE]
+    )
+
+    start = sync(client, headers)
+    assert start["devices"] == [] and start["users"] == []
+    token = start["next_token"]
+
+    client.patch(
+        f"{VERSION_URL}{DEVICE_URL}/{kept_id}", json={"name": "Drill"}, headers=headers
+    )
+    client.delete(f"{VERSION_URL}{DEVICE_URL}/{deleted_id}", headers=headers)
+
+    changes = sync(client, headers, since=token)
+    assert changes["devices"] == [
+        {"id": str(kept_id), "name": "Drill", "android_id": "a3f9c2b7d18e44fa"}
+    ]
+    assert changes["deleted"] == {
+        "users": [],
+        "roles": [],
+        "devices": [str(deleted_id)],
+    }
+    assert changes["has_more"] is False
+
+    # nothing changed since, so the token comes back unchanged
+    again = sync(client, headers, since=changes["next_token"])
+    assert again["devices"] == [] and again["deleted"]["devices"] == []
+    assert again["next_token"] == changes["next_token"]
+
+
+async def test_sync_pages_through_changes(client):
+    headers = await create_auth_headers_for_user(
+        SYNC_PERMISSIONS + [Permissions.CREATE_ROLE, Permissions.CREATE_USER]
+    )
+    token = sync(client, headers)["next_token"]
+    client.post(f"{VERSION_URL}{ROLE_URL}/", json={"name": "operator"}, headers=headers)
+    client.post(
+        f"{VERSION_URL}{USER_URL}/",
+        json={
+            "username": "jdoe",
+            "first_name": "John",
+            "last_name": "Doe",
+            "password": "StrongPass123!",
+        },
+        headers=headers,
+    )
+
+    first = sync(client, headers, since=token, limit=1)
+    second = sync(client, headers, since=first["next_token"], limit=1)
+
+    assert first["has_more"] is True
+    assert [r["name"] for r in first["roles"]] == ["operator"]
+    assert second["has_more"] is False
+    assert [u["username"] for u in second["users"]] == ["jdoe"]
+    assert "password" not in second["users"][0]
+
+
+async def test_sync_requires_all_read_permissions(client):
+    headers = await create_auth_headers_for_user([Permissions.GET_DEVICES])
+
+    resp = client.get(f"{VERSION_URL}{SYNC_URL}/", headers=headers)
+
+    assert resp.status_code == 403
+
+
+@pytest.mark.parametrize(
+    "since",
+    [
+        "not-a-token",
+        "%C3%A9",
+        # 16 bytes of 0xff: beyond the signed 64-bit range of xid8
+        base64.urlsafe_b64encode(b"\xff" * 16).rstrip(b"=").decode(),
+    ],
+)
+async def test_sync_rejects_invalid_token(client, since):
+    headers = await create_auth_headers_for_user(SYNC_PERMISSIONS)
+
+    resp = client.get(f"{VERSION_URL}{SYNC_URL}/?since={since}", headers=headers)
+
+    assert resp.status_code == 422
+    assert resp.json() == {"detail": "Invalid sync token"}
@@ -0,0 +1,120 @@
+from uuid import uuid4
+
+from config.permissions import Permissions
+from tests.conftest import USER_URL, VERSION_URL
+from tests.utils_for_tests import _create_roles, create_auth_headers_for_user
+from utils.hashing import Hasher
+
+
+async def test_bulk_create_users(
+    client, create_role_in_database, get_user_from_database
+):
+    role_ids = [
+        str(role["id"]) for role in await _create_roles(create_role_in_database)
+    ]
+    items = [
+        {
+            "username": f"operator{i}",
+            "first_name": "Ivan",
+            "last_name": f"Operator{i}",
+            "password": "StrongPass123!",
+            "role_ids": role_ids,
+        }
+        for i in range(3)
+    ]
+
+    resp = client.post(
+        f"{VERSION_URL}{USER_URL}/bulk",
+        json={"items": items},
+        headers=await create_auth_headers_for_user([Permissions.CREATE_USER]),
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["created"] == len(items)
+    assert data["failed"] == 0
+    for item, result in zip(items, data["results"]):
+        user_from_db = await get_user_from_database(result["id"])
+        assert user_from_db["username"] == item["username"]
+        assert [str(role_id) for role_id in user_from_db["role_ids"]] == role_ids
+        assert Hasher.verify_password(item["password"], user_from_db["password"])
+        assert user_from_db["full_name_tsv"]
+
+
+async def test_bulk_create_users_reports_errors(
+    client, create_role_in_database, create_user_in_database, get_project_settings
+):
+    settings = await get_project_settings()
+    super_role_id = uuid4()
+    await create_role_in_database(
+        {"id": super_role_id, "name": settings.SUPER_ROLE_NAME, "permissions": []}
+    )
+    await create_user_in_database(
+        {
+            "id": uuid4(),
+            "username": "taken",
+            "first_name": "John",
+            "last_name": "Doe",
+            "role_ids": [],
+        }
+    )
+    missing_role_id = uuid4()
+    items = [
+        {"username": "TAKEN", "first_name": "A", "last_name": "B"},
+        {"username": "fresh", "first_name": "A", "last_name": "B"},
+        {"username": "Fresh", "first_name": "A", "last_name": "B"},
+        {
+            "username": "with_missing_role",
+            "first_name": "A",
+            "last_name": "B",
+            "role_ids": [str(missing_role_id)],
+        },
+        {
+            "username": "wannabe_admin",
+            "first_name": "A",
+            "last_name": "B",
+            "role_ids": [str(super_role_id)],
+        },
+    ]
+
+    resp = client.post(
+        f"{VERSION_URL}{USER_URL}/bulk",
+        json={"items": items},
+        headers=await create_auth_headers_for_user([Permissions.CREATE_USER]),
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["created"] == 1
+    assert [result["error"] for result in data["results"]] == [
+        "User with username TAKEN already exists",
+        None,
+        "User with username Fresh is repeated in batch",
+        f"Role with id {missing_role_id} not found",
+        "Creating a superuser is forbidden",
+    ]
+
+
+async def test_bulk_create_users_rejected_item_claims_nothing(client):
+    missing_role_id = uuid4()
+    items = [
+        {
+            "username": "fresh",
+            "first_name": "A",
+            "last_name": "B",
+            "role_ids": [str(missing_role_id)],
+        },
+        {"username": "Fresh", "first_name": "A", "last_name": "B"},
+    ]
+
+    resp = client.post(
+        f"{VERSION_URL}{USER_URL}/bulk",
+        json={"items": items},
+        headers=await create_auth_headers_for_user([Permissions.CREATE_USER]),
+    )
+
+    assert resp.status_code == 200
+    assert [result["error"] for result in resp.json()["results"]] == [
+        f"Role with id {missing_role_id} not found",
+        None,
+    ]
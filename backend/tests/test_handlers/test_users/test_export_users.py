@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+
+from config.permissions import Permissions
+from tests.conftest import USER_URL, VERSION_URL
+from tests.utils_for_tests import (
+    _create_roles,
+    _create_users,
+    create_auth_headers_for_user,
+)
+
+
+async def test_export_users_ndjson(
+    client, create_role_in_database, create_user_in_database
+):
+    role_ids = [
+        str(role["id"]) for role in await _create_roles(create_role_in_database)
+    ]
+    users = await _create_users(create_user_in_database, role_ids)
+    headers = await create_auth_headers_for_user([Permissions.GET_USERS])
+
+    resp = client.get(f"{VERSION_URL}{USER_URL}/export", headers=headers)
+
+    assert resp.status_code == 200
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["id"] for row in rows] == sorted(str(u["id"]) for u in users)
+    assert all("password" not in row for row in rows)
+    assert all(row["role_ids"] == role_ids for row in rows)
+
+
+async def test_export_users_csv(
+    client, create_role_in_database, create_user_in_database
+):
+    role_ids = [
+        str(role["id"]) for role in await _create_roles(create_role_in_database)
+    ]
+    users = await _create_users(create_user_in_database, role_ids)
+    headers = await create_auth_headers_for_user([Permissions.GET_USERS])
+
+    resp = client.get(f"{VERSION_URL}{USER_URL}/export?format=csv", headers=headers)
+
+    assert resp.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == len(users)
+    assert "password" not in rows[0]
+    assert {row["username"] for row in rows} == {u["username"] for u in users}
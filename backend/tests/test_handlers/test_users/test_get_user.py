@@ -140,6 +140,52 @@ async def test_get_all_users(client, create_role_in_database, create_user_in_dat
     assert len(data) == len(users)
 
 
+async def test_get_users_never_return_password(
+    client, create_role_in_database, create_user_in_database
+):
+    role_ids = [
+        str(role["id"]) for role in await _create_roles(create_role_in_database)
+    ]
+    users = await _create_users(create_user_in_database, role_ids)
+    headers = await create_auth_headers_for_user([Permissions.GET_USERS])
+
+    list_resp = client.get(f"{VERSION_URL}{USER_URL}/", headers=headers)
+    one_resp = client.get(f"{VERSION_URL}{USER_URL}/{users[0]['id']}", headers=headers)
+
+    assert list_resp.headers["content-type"] == "application/json"
+    assert all("password" not in user for user in list_resp.json())
+    assert one_resp.status_code == 200
+    assert "password" not in one_resp.json()
+    assert set(one_resp.json()) == set(list_resp.json()[0])
+
+
+async def test_get_all_users_paginated(
+    client, create_role_in_database, create_user_in_database
+):
+    role_ids = [
+        str(role["id"]) for role in await _create_roles(create_role_in_database)
+    ]
+    users = await _create_users(create_user_in_database, role_ids)
+    headers = await create_auth_headers_for_user([Permissions.GET_USERS])
+
+    resp = client.get(f"{VERSION_URL}{USER_URL}/?limit=2", headers=headers)
+    assert resp.status_code == 200
+    first_page = resp.json()
+    assert len(first_page) == 2
+    cursor = resp.headers["X-Next-Cursor"]
+
+    resp = client.get(
+        f"{VERSION_URL}{USER_URL}/?limit=2&after={cursor}", headers=headers
+    )
+    assert resp.status_code == 200
+    second_page = resp.json()
+    assert len(second_page) == 1
+    assert "X-Next-Cursor" not in resp.headers
+
+    returned_ids = [user["id"] for user in first_page + second_page]
+    assert returned_ids == sorted(str(user["id"]) for user in users)
+
+
 async def test_get_users_by_name_exact_match(
     client, create_role_in_database, create_user_in_database
 ):
@@ -369,3 +415,55 @@ async def test_fulltext_search_parametrized(
         f"Got: {len(returned_ids)} -> {returned_ids}\n"
         f"Returned data: {data}"
     )
+
+
+async def test_search_users_ranked_best_match_first(client, create_user_in_database):
+    for username, first_name in [
+        ("xyz", "John"),
+        ("bigjohn", "Ann"),
+        ("johnny", "Ann"),
+        ("john", "Ann"),
+    ]:
+        await create_user_in_database(
+            {
+                "id": uuid4(),
+                "username": username,
+                "first_name": first_name,
+                "last_name": "Doe",
+            }
+        )
+    headers = await create_auth_headers_for_user([Permissions.GET_USERS])
+
+    resp = client.get(f"{VERSION_URL}{USER_URL}/?name=john", headers=headers)
+    limited = client.get(f"{VERSION_URL}{USER_URL}/?name=john&limit=2", headers=headers)
+
+    assert [u["username"] for u in resp.json()] == ["john", "johnny", "bigjohn", "xyz"]
+    assert [u["username"] for u in limited.json()] == ["john", "johnny"]
+
+
+async def test_batch_get_users(client, create_user_in_database):
+    user_id = await create_user_in_database(
+        {
+            "id": uuid4(),
+            "username": "jdoe",
+            "first_name": "John",
+            "last_name": "Doe",
+            "password": "Pass123!",
+            "role_ids": [],
+        }
+    )
+    missing_id = uuid4()
+    headers = await create_auth_headers_for_user([Permissions.GET_USERS])
+
+    resp = client.post(
+        f"{VERSION_URL}{USER_URL}/batch-get",
+        json={"ids": [str(missing_id), str(user_id)]},
+        headers=headers,
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert list(data["items"]) == [str(user_id)]
+    assert data["items"][str(user_id)]["username"] == "jdoe"
+    assert "password" not in data["items"][str(user_id)]
+    assert data["missing"] == [str(missing_id)]
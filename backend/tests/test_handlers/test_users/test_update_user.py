@@ -351,3 +351,33 @@ async def test_update_user_all_validation_errors(
 
     assert resp.status_code == expected_status, resp.text
     assert expected_error_fragment in str(resp.json()), resp.json()
+
+
+async def test_update_user_name_is_searchable(client, create_user_in_database):
+    user_id = await create_user_in_database(
+        {
+            "id": uuid4(),
+            "username": "renamed",
+            "first_name": "Ivan",
+            "last_name": "Petrov",
+            "patronymic": "Sergeevich",
+            "password": "Pass123!",
+            "role_ids": [],
+        }
+    )
+    headers = await create_auth_headers_for_user(
+        [Permissions.UPDATE_USER, Permissions.GET_USERS]
+    )
+
+    resp = client.patch(
+        f"{VERSION_URL}{USER_URL}/{user_id}",
+        json={"last_name": "Sidorov"},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+
+    resp = client.get(f"{VERSION_URL}{USER_URL}/?name=Sidorov", headers=headers)
+    assert [user["id"] for user in resp.json()] == [str(user_id)]
+
+    resp = client.get(f"{VERSION_URL}{USER_URL}/?name=Petrov", headers=headers)
+    assert resp.json() == []
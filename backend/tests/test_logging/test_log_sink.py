@@ -0,0 +1,121 @@
+import logging
+import queue
+import threading
+import time
+
+import pytest
+
+from api.core.logging.log_sink import (
+    BatchingQueueListener,
+    BatchRotatingFileHandler,
+    LogQueueHandler,
+)
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.batches: list[list[str]] = []
+        self.closed = False
+
+    def emit_batch(self, records: list[logging.LogRecord]) -> None:
+        self.batches.append([r.getMessage() for r in records])
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def make_record(i: int) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": f"line {i}", "levelno": logging.INFO})
+
+
+def wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def listeners():
+    started = []
+
+    def start(log_queue, handler, batch_size, flush_interval):
+        listener = BatchingQueueListener(log_queue, handler, batch_size, flush_interval)
+        listener.start()
+        started.append(listener)
+        return listener
+
+    yield start
+    for listener in started:
+        listener.stop()
+
+
+def test_full_queue_drops_and_counts_records():
+    handler = LogQueueHandler(queue.Queue(maxsize=2))
+
+    for i in range(5):
+        handler.handle(make_record(i))
+
+    assert handler.dropped == 3
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == [
+        "line 0",
+        "line 1",
+    ]
+
+
+def test_full_queue_blocks_until_there_is_room():
+    handler = LogQueueHandler(queue.Queue(maxsize=1), block_on_full=True)
+    handler.handle(make_record(0))
+
+    writer = threading.Thread(target=handler.handle, args=(make_record(1),))
+    writer.start()
+    writer.join(timeout=0.1)
+    assert writer.is_alive()
+
+    assert handler.queue.get_nowait().getMessage() == "line 0"
+    writer.join(timeout=2)
+    assert not writer.is_alive()
+    assert handler.queue.get_nowait().getMessage() == "line 1"
+    assert handler.dropped == 0
+
+
+def test_batch_is_written_once_full(listeners):
+    log_queue, handler = queue.Queue(), RecordingHandler()
+    listener = listeners(log_queue, handler, batch_size=3, flush_interval=60)
+
+    for i in range(4):
+        log_queue.put(make_record(i))
+
+    wait_for(lambda: listener.written == 3)
+    assert handler.batches == [["line 0", "line 1", "line 2"]]
+
+
+def test_partial_batch_is_written_after_flush_interval(listeners):
+    log_queue, handler = queue.Queue(), RecordingHandler()
+    listener = listeners(log_queue, handler, batch_size=100, flush_interval=0.05)
+
+    log_queue.put(make_record(0))
+
+    wait_for(lambda: listener.written == 1)
+    assert handler.batches == [["line 0"]]
+
+
+def test_stop_drains_the_queue_and_closes_the_file(tmp_path):
+    log_file = tmp_path / "app.log"
+    file_handler = BatchRotatingFileHandler(log_file, encoding="utf-8")
+    log_queue = queue.Queue()
+    listener = BatchingQueueListener(
+        log_queue, file_handler, batch_size=100, flush_interval=60
+    )
+    listener.start()
+
+    for i in range(5):
+        log_queue.put(make_record(i))
+    listener.stop()
+
+    assert listener.written == 5
+    assert file_handler.stream is None
+    assert log_file.read_text(encoding="utf-8").splitlines() == [
+        f"line {i}" for i in range(5)
+    ]
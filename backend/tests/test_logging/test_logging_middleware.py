@@ -0,0 +1,121 @@
+import json
+import logging
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from api.core.logging.logger_config import logger
+from api.core.logging.logging_middleware import (
+    MAX_BODY_LOG_SIZE,
+    BodyCapture,
+    LoggingMiddleware,
+)
+
+
+async def echo(request: Request) -> Response:
+    return Response(await request.body(), media_type=request.headers["content-type"])
+
+
+async def fail(request: Request) -> Response:
+    raise RuntimeError("boom")
+
+
+app = LoggingMiddleware(
+    Starlette(routes=[Route("/echo", echo, methods=["POST"]), Route("/fail", fail)])
+)
+
+
+@pytest.fixture
+def logged(caplog, monkeypatch):
+    # the migrations' fileConfig() disables loggers that already exist
+    monkeypatch.setattr(logger, "disabled", False)
+    caplog.set_level(logging.INFO, logger=logger.name)
+
+    def records() -> list[dict]:
+        return [json.loads(r.getMessage()) for r in caplog.records]
+
+    return records
+
+
+def test_body_capture_keeps_first_bytes_up_to_limit():
+    captured = BodyCapture(limit=5)
+    for chunk in (b"abc", b"defg", b"hi"):
+        captured.feed(chunk)
+
+    assert captured.getvalue() == b"abcde"
+    assert captured.size == 9
+    assert captured.truncated
+
+
+async def test_streamed_response_passes_through_unchanged(logged):
+    chunks = [b"first,", b"second,", b""]
+
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for i, chunk in enumerate(chunks):
+            more = i < len(chunks) - 1
+            await send({"type": "http.response.body", "body": chunk, "more_body": more})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/stream", "headers": []}
+    await LoggingMiddleware(streaming_app)(scope, receive, send)
+
+    assert [m.get("body") for m in sent[1:]] == chunks
+    assert [m.get("more_body") for m in sent[1:]] == [True, True, False]
+    assert logged()[-1]["response_body"] == "first,second,"
+
+
+def test_bodies_over_limit_are_not_logged(logged):
+    client = TestClient(app)
+    payload = {"data": "x" * MAX_BODY_LOG_SIZE}
+
+    response = client.post("/echo", json=payload)
+
+    assert response.json() == payload
+    record = logged()[-1]
+    assert record["request_body"].startswith("<text too long:")
+    assert record["response_body"].startswith("<response too long:")
+
+
+def test_secret_fields_are_masked(logged):
+    client = TestClient(app)
+
+    client.post(
+        "/echo",
+        json={"username": "ann", "password": "p4ss", "nested": [{"api_key": "k"}]},
+    )
+    client.post("/echo", data={"refresh_token": "t", "name": "ann"})
+
+    json_body, form_body = (r["request_body"] for r in logged()[-2:])
+    assert json_body == {
+        "username": "ann",
+        "password": "********",
+        "nested": [{"api_key": "********"}],
+    }
+    assert form_body == "refresh_token=%2A%2A%2A%2A%2A%2A%2A%2A&name=ann"
+
+
+def test_request_is_logged_when_app_raises(logged):
+    client = TestClient(app)
+
+    with pytest.raises(RuntimeError):
+        client.get("/fail?attempt=1")
+
+    record = logged()[-1]
+    assert (record["method"], record["path"], record["status_code"]) == (
+        "GET",
+        "/fail",
+        500,
+    )
+    assert record["query_params"] == {"attempt": "1"}
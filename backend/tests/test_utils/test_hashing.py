@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from utils.hashing import HashingPool
+
+
+async def test_hashing_pool_rejects_beyond_workers_and_queue():
+    pool = HashingPool("thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        busy = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await pool.run(release.wait)
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.detail == "Too many concurrent password operations."
+        assert pool.stats()["rejected"] == 1
+        assert (pool.stats()["running"], pool.stats()["queued"]) == (1, 1)
+    finally:
+        release.set()
+        await asyncio.gather(*busy)
+        pool.shutdown()
+
+    assert pool.stats()["completed"] == 2
+
+
+async def test_hashing_pool_counts_only_successful_runs():
+    pool = HashingPool("thread", max_workers=1, max_queue=0)
+
+    def fail():
+        raise ValueError("bad hash")
+
+    try:
+        with pytest.raises(ValueError):
+            await pool.run(fail)
+        await pool.run(lambda: None)
+    finally:
+        pool.shutdown()
+
+    assert pool.stats()["completed"] == 1
+    assert pool.stats()["running"] == 0
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Literal
+
+from pydantic import BaseModel, TypeAdapter
+
+from api.core.config import get_settings
+
+settings = get_settings()
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _csv_cell(value):
+    return json.dumps(value) if isinstance(value, (list, dict)) else value
+
+
+async def export_rows(
+    items: AsyncIterator[BaseModel],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[str]:
+    """Serialize ``items`` through ``schema`` as NDJSON or CSV.
+
+    The first row is sent on its own so the client sees data immediately,
+    the rest is grouped into chunks of EXPORT_BATCH_SIZE rows, so memory stays
+    bounded by one chunk regardless of how many rows are exported.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # dumping through the adapter writes subclasses (User for ShowUser) with
+    # the schema's fields only
+    adapter = TypeAdapter(schema)
+    fields = list(schema.model_fields)
+    if export_format == "csv":
+        writer.writerow(fields)
+
+    rows_in_chunk = 0
+    first_chunk = True
+    async for item in items:
+        row = adapter.validate_python(item, from_attributes=True)
+        if export_format == "csv":
+            data = adapter.dump_python(row, mode="json")
+            writer.writerow([_csv_cell(data[field]) for field in fields])
+        else:
+            buffer.write(adapter.dump_json(row).decode())
+            buffer.write("\n")
+        rows_in_chunk += 1
+        if first_chunk or rows_in_chunk >= settings.EXPORT_BATCH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows_in_chunk = 0
+            first_chunk = False
+
+    if chunk := buffer.getvalue():
+        yield chunk
@@ -1,8 +1,92 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal
+
 from passlib.context import CryptContext
 
+from api.core.config import get_settings
+from api.core.exceptions import AppExceptions
+
+settings = get_settings()
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+class HashingPool:
+    """Bounded executor for bcrypt work.
+
+    At most ``max_workers`` hashes run at once, at most ``max_queue`` more wait
+    for a free worker, anything beyond that is rejected with 503.
+    """
+
+    def __init__(
+        self, kind: Literal["thread", "process"], max_workers: int, max_queue: int
+    ):
+        self._kind = kind
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                executor_class = (
+                    ProcessPoolExecutor
+                    if self._kind == "process"
+                    else ThreadPoolExecutor
+                )
+                self._executor = executor_class(max_workers=self._max_workers)
+            return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._in_flight >= self._max_workers + self._max_queue:
+                self._rejected += 1
+                raise AppExceptions.service_unavailable_exception(
+                    "Too many concurrent password operations."
+                )
+            self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def stats(self) -> dict[str, int | str]:
+        with self._lock:
+            return {
+                "kind": self._kind,
+                "workers": self._max_workers,
+                "running": min(self._in_flight, self._max_workers),
+                "queued": max(self._in_flight - self._max_workers, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+hashing_pool = HashingPool(
+    kind=settings.HASHING_EXECUTOR,
+    max_workers=settings.HASHING_MAX_WORKERS,
+    max_queue=settings.HASHING_MAX_QUEUE,
+)
+
+
 class Hasher:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -11,3 +95,13 @@ class Hasher:
     @staticmethod
     def get_password_hash(password: str) -> str:
         return pwd_context.hash(password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        return await hashing_pool.run(
+            Hasher.verify_password, plain_password, hashed_password
+        )
+
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        return await hashing_pool.run(Hasher.get_password_hash, password)
@@ -1,4 +1,7 @@
 import datetime
+import hashlib
+import time
+from collections import OrderedDict
 
 from jose import JWTError, jwt
 
@@ -8,6 +11,58 @@ from api.core.exceptions import AppExceptions
 settings = get_settings()
 
 
+class VerifiedTokenCache:
+    """Bounded LRU of already verified claims, keyed by the token digest.
+
+    An entry is only served until the token's ``exp``; tokens without ``exp``
+    are never cached. Cached claims are shared between requests, treat them as
+    read-only.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        if self._max_size <= 0 or not isinstance(claims.get("exp"), (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = (claims["exp"], claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+token_cache = VerifiedTokenCache(max_size=settings.JWT_CACHE_SIZE)
+
+
 class JWT:
     @staticmethod
     async def create_jwt_token(
@@ -32,10 +87,14 @@ class JWT:
     ) -> dict[str, str]:
         if token_type == "access":
             token_key = settings.SECRET_KEY_FOR_ACCESS
+            if (payload := token_cache.get(token)) is not None:
+                return payload
         try:
             payload = jwt.decode(token, token_key, algorithms=[settings.ALGORITHM])
             if "sub" not in payload.keys():
                 raise JWTError
         except JWTError:
             raise AppExceptions.unauthorized_exception("Could not validate credentials")
+        if token_type == "access":
+            token_cache.put(token, payload)
         return payload
@@ -0,0 +1,53 @@
+import base64
+import binascii
+import struct
+from typing import Sequence
+from uuid import UUID
+
+from api.core.exceptions import AppExceptions
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: UUID) -> str:
+    return base64.urlsafe_b64encode(last_id.bytes).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str | None) -> UUID | None:
+    if not cursor:
+        return None
+    try:
+        return UUID(bytes=base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise AppExceptions.validation_exception("Invalid pagination cursor")
+
+
+def next_cursor(items: Sequence, limit: int) -> str | None:
+    """Cursor for the page after ``items``, or None if this was the last page."""
+    if len(items) < limit:
+        return None
+    return encode_cursor(items[-1].id)
+
+
+# signed, so positions stay within xid8/bigint and negative ones are rejected
+SYNC_TOKEN_FORMAT = ">qq"
+
+
+def encode_sync_token(position: tuple[int, int]) -> str:
+    token = struct.pack(SYNC_TOKEN_FORMAT, *position)
+    return base64.urlsafe_b64encode(token).rstrip(b"=").decode()
+
+
+def decode_sync_token(token: str | None) -> tuple[int, int] | None:
+    if not token:
+        return None
+    try:
+        position = struct.unpack(
+            SYNC_TOKEN_FORMAT,
+            base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)),
+        )
+    except (binascii.Error, struct.error, ValueError):
+        raise AppExceptions.validation_exception("Invalid sync token")
+    if any(value < 0 for value in position):
+        raise AppExceptions.validation_exception("Invalid sync token")
+    return position